@@ -1,11 +1,17 @@
 import streamlit as st
 import time
 import os
-import json
-import pandas as pd
-import yfinance as yf
+import datetime
 import streamlit.components.v1 as components
-import base64
+from assets import asset_url, video_html
+from refresher import MarketRefresher
+from tick_feed import TickFeed
+from currency_matrix import CurrencyMatrix, parse_pair
+import scheduler
+import metrics
+import render
+
+_rerun_started = time.perf_counter()
 
 # ================= 1. PAGE CONFIG & BRANDING =================
 st.set_page_config(page_title="AlphaEdge | Trading Intelligence", page_icon="🅰️", layout="wide", initial_sidebar_state="expanded")
@@ -61,53 +67,102 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# ================= 2. CACHED DATA FUNCTIONS =================
-@st.cache_data(ttl=60)
+# ================= 2. SHARED MARKET DATA =================
+@st.cache_resource
+def get_refresher():
+    """One background refresher per server process, shared by every session"""
+    return MarketRefresher(TICKER_MAP).start()
+
 def get_dashboard_data():
-    results = []
-    for symbol, y_sym in TICKER_MAP.items():
-        try:
-            ticker = yf.Ticker(y_sym)
-            df = ticker.history(period="1d", interval="5m")
-            if df.empty: df = ticker.history(period="5d", interval="1h")
-            
-            if not df.empty:
-                current_price = df['Close'].iloc[-1]
-                sma_20 = df['Close'].rolling(window=20).mean().iloc[-1]
-                if pd.isna(sma_20): sma_20 = current_price
-                bias = "BULLISH" if current_price > sma_20 else "BEARISH"
-                open_price = df['Open'].iloc[0] if df['Open'].iloc[0] > 0 else current_price
-                pct_change = ((current_price - open_price) / open_price) * 100
-                score = int(min(max(abs(pct_change) * 50, 1), 10))
-                if bias == "BEARISH": score = -score
-                tech = "Overbought" if score >= 8 else "Oversold" if score <= -8 else "Neutral"
-                
-                results.append({
-                    "Symbol": symbol, "Bias": bias, "Score": score, 
-                    "Trend": "Upward" if bias=="BULLISH" else "Downward",
-                    "Tech": tech, "Price": current_price
-                })
-        except: continue
-    return results
-
-# --- NEW SMART SENTIMENT FUNCTION ---
+    refresher = get_refresher()
+    # Only a brand-new process waits (once) for its first snapshot
+    if refresher.age() is None: refresher.wait_until_ready(timeout=15)
+    return refresher.snapshot()["rows"]
+
 def get_smart_sentiment(ticker_symbol):
-    """Calculates sentiment based on 14-day momentum"""
-    try:
-        stock = yf.Ticker(ticker_symbol)
-        hist = stock.history(period="14d") 
-        if len(hist) < 14:
-            return "Neutral 😐"
-        start_price = hist['Close'].iloc[0]
-        end_price = hist['Close'].iloc[-1]
-        change = ((end_price - start_price) / start_price) * 100
-        if change > 5: return "Strong Buy 🚀"
-        elif change > 1: return "Bullish 📈"
-        elif change < -5: return "Strong Sell 🔻"
-        elif change < -1: return "Bearish 📉"
-        else: return "Neutral ⚖️"
-    except Exception:
-        return "Neutral ⚖️"
+    """Sentiment based on 14-day momentum, read from the shared snapshot"""
+    return get_refresher().snapshot()["sentiment"].get(ticker_symbol, "Neutral ⚖️")
+
+@st.cache_resource
+def get_cot_job():
+    """Background COT refresh shared by every session (only one runs at a time)"""
+    import cot_fetcher
+    return cot_fetcher.RefreshJob()
+
+@st.fragment(run_every=1)
+def cot_job_progress(job):
+    """Polls the running COT refresh without rerunning the whole page"""
+    if job.running():
+        st.progress(job.progress, text=f"⏳ {job.message}")
+    else:
+        st.rerun()  # finished: one full rerun picks up the new cot_live.json
+
+@st.cache_resource
+def get_metrics_server():
+    """Prometheus /metrics endpoint, only when ALPHAEDGE_METRICS_PORT is set (ALPHAEDGE_METRICS_HOST, default loopback)"""
+    port = os.environ.get("ALPHAEDGE_METRICS_PORT")
+    return metrics.serve(int(port), os.environ.get("ALPHAEDGE_METRICS_HOST", metrics.HOST)) if port else None
+
+get_metrics_server()
+
+@st.cache_resource
+def get_tick_feed():
+    """Bridge quotes from live_prices.json (+ optional local UDP feed) in per-symbol ring buffers"""
+    port = os.environ.get("ALPHAEDGE_TICK_PORT")
+    return TickFeed(udp_port=int(port) if port else None).start()
+
+# --- LIVE FRAGMENTS (re-run on their own timer, the rest of the page stays put) ---
+TABLE_REFRESH_SECONDS = 2       # ticks land sub-second, the table is a memory read
+LIVE_REFRESH_SECONDS = 10
+
+@st.fragment(run_every=TABLE_REFRESH_SECONDS)
+@metrics.timed("fragment_seconds", fragment="dashboard_table")
+def live_dashboard_table():
+    get_dashboard_data()   # only blocks in a brand-new process
+    refresher = get_refresher()
+    snap = refresher.snapshot()
+    ticks = get_tick_feed().latest()
+    # Row HTML is built once per snapshot; only the price/source cells follow the ticks
+    parts = render.cached("heatmap_rows", snap["updated_at"], lambda: render.heatmap_parts(snap["rows"]))
+    tick_version = tuple(sorted((sym, p) for sym, (_, p) in ticks.items()))
+    html = render.cached("heatmap", (snap["updated_at"], tick_version), lambda: render.heatmap_table(parts, ticks))
+    st.markdown(html, unsafe_allow_html=True)
+    data_age = refresher.age()
+    if data_age is not None:
+        # Warm = restored from the last run's snapshot, a refresh is on its way
+        warm = " · ♻️ restored, refreshing..." if snap.get("warm") else ""
+        st.caption(f"🕒 Snapshot age: {int(data_age)}s{warm}")
+
+@st.cache_resource
+def get_currency_matrix():
+    """Cross-rate / strength engine shared by every session, fed from our own quotes"""
+    return CurrencyMatrix()
+
+@st.fragment(run_every=TABLE_REFRESH_SECONDS)
+@metrics.timed("fragment_seconds", fragment="currency_matrix")
+def live_currency_matrix():
+    # Fresher bridge quotes first (crosses included), then the TICKER_MAP majors from the snapshot
+    snap = get_refresher().snapshot()
+    fx_rows = [r for r in snap["rows"] if parse_pair(r['Symbol'])]
+    quotes = {sym: tp for sym, tp in get_tick_feed().latest().items() if parse_pair(sym)}
+    for r in fx_rows: quotes.setdefault(r['Symbol'], (snap["updated_at"], r['Price']))
+    if not quotes:
+        st.info("⏳ Waiting for FX quotes...")
+        return
+    matrix = get_currency_matrix()
+    matrix.sync(quotes, reference={r['Symbol']: r.get('Open') for r in fx_rows})
+    matrix_html, strength_html = render.cached("fx_matrix", matrix.version, lambda: render.fx_tables(matrix))
+    col_matrix, col_strength = st.columns([4, 1])
+    col_matrix.markdown(matrix_html, unsafe_allow_html=True)
+    col_strength.markdown(strength_html, unsafe_allow_html=True)
+    st.caption("Cross rates from TICKER_MAP + bridge quotes · % change since the session open")
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+@metrics.timed("fragment_seconds", fragment="sentiment_metric")
+def live_sentiment_metric(focus_ticker):
+    y_sym = TICKER_MAP.get(focus_ticker, "EURUSD=X")
+    current_sentiment = get_smart_sentiment(y_sym)
+    st.metric(label="AI Momentum Sentiment", value=current_sentiment)
 
 # --- TRADINGVIEW AFFILIATE POP-UP DIALOG ---
 @st.dialog("📈 ADVANCED TRADINGVIEW CHART", width="large")
@@ -118,11 +173,10 @@ def show_popup_chart(ticker):
     banner_path = "static/tv_banner.jpg"
     if os.path.exists(banner_path):
         try:
-            # We encode the local image so it loads flawlessly inside the pop-up link
-            encoded_img = base64.b64encode(open(banner_path, "rb").read()).decode()
+            # Served by URL (content-hashed), so the browser caches it across reruns
             st.markdown(f"""
             <a href="{tv_link}" target="_blank">
-                <img src="data:image/jpeg;base64,{encoded_img}" width="100%" style="border-radius:10px; margin-bottom:15px;">
+                <img src="{asset_url(banner_path)}" width="100%" style="border-radius:10px; margin-bottom:15px;">
             </a>
             """, unsafe_allow_html=True)
         except Exception as e:
@@ -152,11 +206,11 @@ def show_popup_chart(ticker):
     with c1:
         if os.path.exists(video1_path):
             st.caption("📺 Pro Features Overview")
-            st.video(video1_path, start_time=0)
+            st.markdown(video_html(video1_path), unsafe_allow_html=True)
     with c2:
         if os.path.exists(video2_path):
             st.caption("📺 Advanced Charting Tools")
-            st.video(video2_path, start_time=0)
+            st.markdown(video_html(video2_path), unsafe_allow_html=True)
 
 
 # ================= 3. SIDEBAR =================
@@ -166,9 +220,7 @@ with st.sidebar:
     
     if logo_file:
         try:
-            with open(logo_file, "rb") as f: encoded = base64.b64encode(f.read()).decode()
-            mime = "image/gif" if logo_file.endswith(".gif") else "image/png"
-            st.markdown(f'<div style="text-align:center;margin-bottom:20px;"><img src="data:{mime};base64,{encoded}" width="100%"></div>', unsafe_allow_html=True)
+            st.markdown(f'<div style="text-align:center;margin-bottom:20px;"><img src="{asset_url(logo_file)}" width="100%"></div>', unsafe_allow_html=True)
         except: pass
     else:
         st.markdown('<div style="text-align:center;"><h1>🅰️</h1><h2>AlphaEdge</h2></div>', unsafe_allow_html=True)
@@ -217,12 +269,12 @@ with st.sidebar:
         p_text = "🐐 GET FUNDED TODAY ➤"
 
     if os.path.exists(p_logo):
-        st.image(p_logo, use_container_width=True)
+        st.markdown(f'<img src="{asset_url(p_logo)}" width="100%">', unsafe_allow_html=True)
     else:
         st.error(f"⚠️ '{p_logo}' not found in 'static' folder")
 
     if os.path.exists(p_video):
-        st.video(p_video, start_time=0)
+        st.markdown(video_html(p_video), unsafe_allow_html=True)
     else:
         st.info(f"⚠️ '{p_video}' not found in 'static' folder")
 
@@ -253,99 +305,115 @@ with st.sidebar:
         show_popup_chart(focus_ticker)
 
 # ================= 4. MAIN NAVIGATION =================
+# Lazy tabs: switching reruns the script and only the open tab's body executes,
+# so hidden tabs send no HTML/iframes at all.
 tab_dash, tab_cot, tab_sent, tab_ind, tab_fx, tab_news, tab_cal = st.tabs([
     "  📊 DASHBOARD  ", "  📊 COT DATA  ", "  📈 SENTIMENT  ", 
     "  🏙️ INDICES  ", "  💱 CURRENCY MATRIX  ", "  📰 LIVE NEWS  ", "  📅 CALENDAR  "
-])
+], key="main_tab", on_change="rerun")
 
 # ================= TAB 1: DASHBOARD =================
-with tab_dash:
-    st.title("📊 ALPHAEDGE COMMAND CENTRE")
-    st.write("⏳ *Analyzing Live Market Structure...*")
+if tab_dash.open:
+    with tab_dash, metrics.timer("tab_seconds", tab="dashboard"):
+        st.title("📊 ALPHAEDGE COMMAND CENTRE")
+        st.write("⏳ *Analyzing Live Market Structure...*")
     
-    data = get_dashboard_data()
-    rows_html = ""
-    if data:
-        for row in data:
-            css_class = "bullish" if row['Bias'] == "BULLISH" else "bearish"
-            rows_html += f"""<tr><td><b>{row['Symbol']}</b></td><td class="{css_class}">{row['Bias']}</td><td class="{css_class}">{row['Score']:+}</td><td>{row['Trend']}</td><td>{row['Tech']}</td><td style="color:#D4AF37; font-weight:bold;">{row['Price']:,.4f}</td><td><span class="live-tag">⚡ LIVE</span></td></tr>"""
-    else:
-        rows_html = "<tr><td colspan='7'>Loading Data...</td></tr>"
-
-    st.markdown(f"""<table class="heatmap-table"><thead><tr><th>SYMBOL</th><th>BIAS</th><th>SCORE</th><th>TREND</th><th>TECH</th><th>PRICE</th><th>SOURCE</th><th>NOTES</th></tr></thead><tbody>{rows_html}</tbody></table>""", unsafe_allow_html=True)
+        live_dashboard_table()
 
-    st.markdown("---")
+        st.markdown("---")
     
-    # --- SMART SENTIMENT INJECTED HERE ---
-    col_title, col_metric = st.columns([3, 1])
-    with col_title:
-        st.subheader(f"📈 LIVE CHART: {focus_ticker}")
-    with col_metric:
-        y_sym = TICKER_MAP.get(focus_ticker, "EURUSD=X")
-        current_sentiment = get_smart_sentiment(y_sym)
-        st.metric(label="AI Momentum Sentiment", value=current_sentiment)
-
-    tv_symbol = TV_MAP.get(focus_ticker, "FX:EURUSD")
-    components.html(f"""<div id="tv_chart_main" style="height:600px;"></div><script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script><script type="text/javascript">new TradingView.widget({{"autosize": true, "symbol": "{tv_symbol}", "interval": "H1", "theme": "dark", "style": "1", "locale": "en", "toolbar_bg": "#f1f3f6", "enable_publishing": false, "hide_side_toolbar": false, "allow_symbol_change": true, "container_id": "tv_chart_main"}});</script>""", height=610)
+        # --- SMART SENTIMENT INJECTED HERE ---
+        col_title, col_metric = st.columns([3, 1])
+        with col_title:
+            st.subheader(f"📈 LIVE CHART: {focus_ticker}")
+        with col_metric:
+            live_sentiment_metric(focus_ticker)
+
+        tv_symbol = TV_MAP.get(focus_ticker, "FX:EURUSD")
+        components.html(f"""<div id="tv_chart_main" style="height:600px;"></div><script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script><script type="text/javascript">new TradingView.widget({{"autosize": true, "symbol": "{tv_symbol}", "interval": "H1", "theme": "dark", "style": "1", "locale": "en", "toolbar_bg": "#f1f3f6", "enable_publishing": false, "hide_side_toolbar": false, "allow_symbol_change": true, "container_id": "tv_chart_main"}});</script>""", height=610)
 
 # ================= TAB 2: COT DATA =================
-with tab_cot:
-    st.title("📊 INSTITUTIONAL POSITIONING")
+if tab_cot.open:
+    with tab_cot, metrics.timer("tab_seconds", tab="cot"):
+        st.title("📊 INSTITUTIONAL POSITIONING")
     
-    col_ctrl, col_info = st.columns([1, 2])
-    with col_ctrl:
-        if st.button("🔄 REFRESH DATA"):
-            import cot_fetcher
-            if cot_fetcher.update_cot_data():
-                st.success("Updated!"); time.sleep(1); st.rerun()
-
-    def make_row(row):
-        l_pct = row.get('long_pct', 0); s_pct = row.get('short_pct', 0)
-        l_cls = "bull-strong" if l_pct > 60 else "bull-med" if l_pct > 50 else ""
-        s_cls = "bear-strong" if s_pct > 60 else "bear-med" if s_pct > 50 else ""
-        net_color = "#2962FF" if row.get('net_pos', 0) > 0 else "#D50000"
-
-        return f"""<tr><td class="symbol-col">{row['Symbol']}</td><td>{int(row['long_pos']):,}</td><td>{int(row['short_pos']):,}</td><td style="color:{'#00E676' if row['change_long']>0 else '#FF5252'}">{int(row['change_long']):+,}</td><td style="color:{'#00E676' if row['change_short']>0 else '#FF5252'}">{int(row['change_short']):+,}</td><td class="{l_cls}">{l_pct:.1f}%</td><td class="{s_cls}">{s_pct:.1f}%</td><td>{row['net_pct']:.2f}%</td><td style="font-weight:bold; background-color:{net_color}; color:white;">{int(row.get('net_pos', 0)):,}</td><td>{int(row['open_int']):,}</td><td>{int(row['change_oi']):+,}</td></tr>"""
-
-    if os.path.exists("cot_live.json"):
-        with open("cot_live.json", "r") as f: data = json.load(f)
-        rows_list = []
-        for sym, vals in data.items():
-            vals['Symbol'] = sym
-            rows_list.append(vals)
-        table_rows = "".join([make_row(row) for row in rows_list])
-        st.markdown(f"""<table class="heatmap-table" style="width:100%; text-align:center;"><thead><tr style="background:#111; color:#D4AF37;"><th>Symbol</th><th>Longs</th><th>Shorts</th><th>Δ Long</th><th>Δ Short</th><th>Long %</th><th>Short %</th><th>Net %</th><th>Net Pos</th><th>OI</th><th>Δ OI</th></tr></thead><tbody>{table_rows}</tbody></table>""", unsafe_allow_html=True)
-    else: st.info("ℹ️ No data found. Click Refresh.")
+        col_ctrl, col_info = st.columns([1, 2])
+        with col_ctrl:
+            import cot_fetcher      # pandas/requests: only once the COT tab is opened
+            job = get_cot_job()
+            # CFTC published since our file was written: refresh in the background
+            # while the table keeps showing last week (a failed run is retried after 15 min,
+            # an unchanged answer after scheduler.COT_RETRY)
+            cot_mtime = os.path.getmtime("cot_live.json") if os.path.exists("cot_live.json") else None
+            if scheduler.cot_due(cot_mtime, last_check=cot_fetcher.last_checked()) and not job.running() and (job.finished_at is None or time.time() - job.finished_at > 900):
+                job.start()
+            if st.button("🔄 REFRESH DATA", disabled=job.running()):
+                job.start()
+        with col_info:
+            if job.running(): cot_job_progress(job)
+            elif job.finished_at:
+                (st.success if job.ok else st.error)(f"{job.message} · {int(time.time() - job.finished_at)}s ago")
+            next_release = datetime.datetime.fromtimestamp(scheduler.next_cot_release(), scheduler.ET)
+            st.caption(f"📅 Next CFTC release: {next_release:%a %d %b %H:%M} ET")
+
+        # Rebuilt only when cot_live.json changes, shared by every session
+        cot_version = render.cot_version("cot_live.json")
+        if cot_version is not None:
+            st.markdown(render.cached("cot", cot_version, lambda: render.cot_table("cot_live.json")), unsafe_allow_html=True)
+        else: st.info("ℹ️ No data found. Click Refresh.")
 
 # ================= TAB 3: SENTIMENT =================
-with tab_sent:
-    st.title("📈 TECHNICAL SENTIMENT")
-    gauge_asset = st.selectbox("Select Asset to Analyze:", list(TICKER_MAP.keys()), key="gauge_sel")
-    tv_gauge = TV_MAP.get(gauge_asset, "FX:EURUSD")
-    st.write(f"Displaying Sentiment for: **{gauge_asset}**")
-    c1, c2 = st.columns(2)
-    with c1: st.caption("1 Hour Interval"); components.html(f"""<div class="tradingview-widget-container"><script type="text/javascript" src="https://s3.tradingview.com/external-embedding/embed-widget-technical-analysis.js" async>{{"interval": "1h", "width": "100%", "isTransparent": true, "height": 450, "symbol": "{tv_gauge}", "showIntervalTabs": false, "displayMode": "single", "locale": "en", "colorTheme": "dark"}}</script></div>""", height=460)
-    with c2: st.caption("4 Hour Interval"); components.html(f"""<div class="tradingview-widget-container"><script type="text/javascript" src="https://s3.tradingview.com/external-embedding/embed-widget-technical-analysis.js" async>{{"interval": "4h", "width": "100%", "isTransparent": true, "height": 450, "symbol": "{tv_gauge}", "showIntervalTabs": false, "displayMode": "single", "locale": "en", "colorTheme": "dark"}}</script></div>""", height=460)
+if tab_sent.open:
+    with tab_sent, metrics.timer("tab_seconds", tab="sentiment"):
+        st.title("📈 TECHNICAL SENTIMENT")
+        gauge_asset = st.selectbox("Select Asset to Analyze:", list(TICKER_MAP.keys()), key="gauge_sel")
+        tv_gauge = TV_MAP.get(gauge_asset, "FX:EURUSD")
+        st.write(f"Displaying Sentiment for: **{gauge_asset}**")
+        c1, c2 = st.columns(2)
+        with c1: st.caption("1 Hour Interval"); components.html(f"""<div class="tradingview-widget-container"><script type="text/javascript" src="https://s3.tradingview.com/external-embedding/embed-widget-technical-analysis.js" async>{{"interval": "1h", "width": "100%", "isTransparent": true, "height": 450, "symbol": "{tv_gauge}", "showIntervalTabs": false, "displayMode": "single", "locale": "en", "colorTheme": "dark"}}</script></div>""", height=460)
+        with c2: st.caption("4 Hour Interval"); components.html(f"""<div class="tradingview-widget-container"><script type="text/javascript" src="https://s3.tradingview.com/external-embedding/embed-widget-technical-analysis.js" async>{{"interval": "4h", "width": "100%", "isTransparent": true, "height": 450, "symbol": "{tv_gauge}", "showIntervalTabs": false, "displayMode": "single", "locale": "en", "colorTheme": "dark"}}</script></div>""", height=460)
 
 # ================= TAB 4: INDICES =================
-with tab_ind:
-    st.title("🏙️ GLOBAL INDICES HEATMAP")
-    components.html("""<iframe src="https://www.tradingview-widget.com/embed-widget/stock-heatmap/?theme=dark&market=america" height="800" width="100%"></iframe>""", height=820)
+if tab_ind.open:
+    with tab_ind, metrics.timer("tab_seconds", tab="indices"):
+        st.title("🏙️ GLOBAL INDICES HEATMAP")
+        components.html("""<iframe src="https://www.tradingview-widget.com/embed-widget/stock-heatmap/?theme=dark&market=america" height="800" width="100%"></iframe>""", height=820)
 
 # ================= TAB 5: FOREX =================
-with tab_fx:
-    st.title("💱 GLOBAL CURRENCY MATRIX")
-    components.html("""<div class="tradingview-widget-container"><script type="text/javascript" src="https://s3.tradingview.com/external-embedding/embed-widget-forex-heat-map.js" async>{"width": "100%", "height": 800, "currencies": ["EUR","USD","JPY","GBP","CHF","AUD","CAD","NZD","ZAR"], "isTransparent": false, "colorTheme": "dark", "locale": "en"}</script></div>""", height=820)
+if tab_fx.open:
+    with tab_fx, metrics.timer("tab_seconds", tab="fx"):
+        st.title("💱 GLOBAL CURRENCY MATRIX")
+        live_currency_matrix()
+        # Third-party heat map only on request (needs the network)
+        if st.toggle("Show TradingView heat map", value=False, key="fx_tv"):
+            components.html("""<div class="tradingview-widget-container"><script type="text/javascript" src="https://s3.tradingview.com/external-embedding/embed-widget-forex-heat-map.js" async>{"width": "100%", "height": 800, "currencies": ["EUR","USD","JPY","GBP","CHF","AUD","CAD","NZD","ZAR"], "isTransparent": false, "colorTheme": "dark", "locale": "en"}</script></div>""", height=820)
 
 # ================= TAB 6: NEWS =================
-with tab_news:
-    st.title("📰 LIVE MARKET NEWS")
-    components.html("""<iframe src="https://www.tradingview-widget.com/embed-widget/timeline/?feedMode=all_symbols&theme=dark" height="800" width="100%"></iframe>""", height=820)
+if tab_news.open:
+    with tab_news, metrics.timer("tab_seconds", tab="news"):
+        st.title("📰 LIVE MARKET NEWS")
+        components.html("""<iframe src="https://www.tradingview-widget.com/embed-widget/timeline/?feedMode=all_symbols&theme=dark" height="800" width="100%"></iframe>""", height=820)
 
 # ================= TAB 7: CALENDAR =================
-with tab_cal:
-    st.title("📅 ECONOMIC CALENDAR")
-    components.html("""<iframe src="https://www.tradingview-widget.com/embed-widget/events/?theme=dark&importance=high" height="800" width="100%"></iframe>""", height=820)
+if tab_cal.open:
+    with tab_cal, metrics.timer("tab_seconds", tab="calendar"):
+        st.title("📅 ECONOMIC CALENDAR")
+        components.html("""<iframe src="https://www.tradingview-widget.com/embed-widget/events/?theme=dark&importance=high" height="800" width="100%"></iframe>""", height=820)
 
 # ================= FIXED FOOTER =================
-st.markdown("""<div class="ticker-footer"><iframe src="https://www.tradingview-widget.com/embed-widget/ticker-tape/?theme=dark#%7B%22symbols%22%3A%5B%7B%22proName%22%3A%22FOREXCOM%3ASPXUSD%22%2C%22title%22%3A%22S%26P%20500%22%7D%2C%7B%22proName%22%3A%22FOREXCOM%3ANSXUSD%22%2C%22title%22%3A%22Nasdaq%20100%22%7D%2C%7B%22proName%22%3A%22FX_IDC%3AEURUSD%22%2C%22title%22%3A%22EUR%2FUSD%22%7D%2C%7B%22proName%22%3A%22OANDA%3AXAUUSD%22%2C%22title%22%3A%22GOLD%22%7D%5D%2C%22showSymbolLogo%22%3Atrue%2C%22colorTheme%22%3A%22dark%22%2C%22isTransparent%22%3Atrue%2C%22displayMode%22%3A%22adaptive%22%2C%22locale%22%3A%22en%22%7D" width="100%" height="40" frameborder="0" scrolling="no" style="margin-top:-10px;"></iframe></div>""", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("""<div class="ticker-footer"><iframe src="https://www.tradingview-widget.com/embed-widget/ticker-tape/?theme=dark#%7B%22symbols%22%3A%5B%7B%22proName%22%3A%22FOREXCOM%3ASPXUSD%22%2C%22title%22%3A%22S%26P%20500%22%7D%2C%7B%22proName%22%3A%22FOREXCOM%3ANSXUSD%22%2C%22title%22%3A%22Nasdaq%20100%22%7D%2C%7B%22proName%22%3A%22FX_IDC%3AEURUSD%22%2C%22title%22%3A%22EUR%2FUSD%22%7D%2C%7B%22proName%22%3A%22OANDA%3AXAUUSD%22%2C%22title%22%3A%22GOLD%22%7D%5D%2C%22showSymbolLogo%22%3Atrue%2C%22colorTheme%22%3A%22dark%22%2C%22isTransparent%22%3Atrue%2C%22displayMode%22%3A%22adaptive%22%2C%22locale%22%3A%22en%22%7D" width="100%" height="40" frameborder="0" scrolling="no" style="margin-top:-10px;"></iframe></div>""", unsafe_allow_html=True)
+
+# ================= HIDDEN ADMIN PANEL (?admin=<ALPHAEDGE_ADMIN_KEY>) =================
+# Off unless the operator sets a key; there is no default a visitor could guess
+ADMIN_KEY = os.environ.get("ALPHAEDGE_ADMIN_KEY", "")
+if ADMIN_KEY and st.query_params.get("admin") == ADMIN_KEY:
+    with st.expander("🛠️ OPERATOR METRICS", expanded=True):
+        stats = metrics.snapshot()
+        st.caption(f"Process-local since start · last rerun {(time.perf_counter() - _rerun_started) * 1000:.0f} ms so far")
+        st.markdown("**⏱️ Timings**")
+        st.dataframe(stats["summaries"], width="stretch", hide_index=True)
+        st.markdown("**🔢 Counters**")
+        st.dataframe(stats["counters"] + stats["gauges"], width="stretch", hide_index=True)
+        st.code(metrics.render(), language="text")
+
+metrics.observe("rerun_seconds", time.perf_counter() - _rerun_started)
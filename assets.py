@@ -0,0 +1,44 @@
+import os
+import shutil
+import hashlib
+import functools
+
+# Streamlit serves ./static at app/static/ when server.enableStaticServing is on
+# (see .streamlit/config.toml). Hashed copies live in static/_v so a file's URL
+# only changes when its bytes do, and browsers can keep it cached.
+STATIC_DIR = "static"
+HASHED_DIR = os.path.join(STATIC_DIR, "_v")
+URL_PREFIX = "app/static/_v"
+
+
+@functools.lru_cache(maxsize=64)
+def _hashed_name(path, mtime_ns, size):
+    """Hashes the file once per (mtime, size) and drops a content-named copy in static/_v"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    name = f"{stem}.{digest.hexdigest()[:12]}{ext}"
+
+    target = os.path.join(HASHED_DIR, name)
+    if not os.path.exists(target):
+        os.makedirs(HASHED_DIR, exist_ok=True)
+        try:
+            os.link(path, target)
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copyfile(path, target)
+    return name
+
+
+def asset_url(path):
+    """Browser URL for a local file; costs one stat() per rerun once hashed"""
+    info = os.stat(path)
+    return f"{URL_PREFIX}/{_hashed_name(os.path.abspath(path), info.st_mtime_ns, info.st_size)}"
+
+
+def video_html(path):
+    """<video> tag pointing at the static URL instead of pushing the mp4 through st.video"""
+    return f'<video src="{asset_url(path)}" controls preload="metadata" style="width:100%; border-radius:5px;"></video>'
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import threading
+import pandas as pd
+import market_data
+
+BAR_DIR = os.path.join("data", "bars")
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# --- HOW MUCH HISTORY TO KEEP / PULL ON A COLD START ---
+RETENTION = {"5m": pd.Timedelta(days=7), "1h": pd.Timedelta(days=60), "1d": pd.Timedelta(days=730)}
+COLD_PERIOD = {"5m": "5d", "1h": "1mo", "1d": "1y"}
+# Oldest start yfinance accepts per intraday interval (a gap past it is fetched cold)
+MAX_LOOKBACK = {"5m": pd.Timedelta(days=59), "1h": pd.Timedelta(days=729)}
+# Warm symbols whose last bars are this close share one delta download
+GROUP_SPAN = {"5m": pd.Timedelta(hours=6), "1h": pd.Timedelta(days=2), "1d": pd.Timedelta(days=7)}
+
+
+def _now(ts):
+    """Current time in the timezone of ts (naive if ts is naive)"""
+    return pd.Timestamp.now(tz=ts.tz)
+
+
+def _group_by_last(last, span):
+    """Splits {symbol: last bar} into lists whose last bars lie within `span` of each other"""
+    groups = []
+    for s in sorted(last, key=lambda s: last[s]):
+        if groups and last[s] - last[groups[-1][0]] <= span:
+            groups[-1].append(s)
+        else:
+            groups.append([s])
+    return groups
+
+
+class BarStore:
+    """On-disk OHLCV store, one Parquet file per symbol and interval.
+
+    Each update only asks upstream for bars since the last stored timestamp
+    (the last bar is re-fetched because it may still be forming), appends
+    them and trims to RETENTION.
+    """
+
+    def __init__(self, provider=None, root=BAR_DIR):
+        self.provider = provider or market_data.get_provider()
+        self.root = root
+        self._frames = {}   # (y_sym, interval) -> DataFrame, mirrors what is on disk
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, y_sym, interval):
+        safe = y_sym.replace("=", "_").replace("^", "_").replace("/", "_")
+        return os.path.join(self.root, f"{safe}_{interval}.parquet")
+
+    # --- READ ---
+    def load(self, y_sym, interval):
+        key = (y_sym, interval)
+        with self._lock:
+            if key in self._frames:
+                return self._frames[key]
+        path = self.path_for(y_sym, interval)
+        df = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame(columns=COLUMNS)
+        with self._lock:
+            self._frames[key] = df
+        return df
+
+    def last_timestamp(self, y_sym, interval):
+        df = self.load(y_sym, interval)
+        return None if df.empty else df.index[-1]
+
+    # --- WRITE ---
+    def append(self, y_sym, interval, new):
+        if new is None or new.empty:
+            return self.load(y_sym, interval)
+        new = new[[c for c in COLUMNS if c in new.columns]].dropna(subset=["Close"])
+        old = self.load(y_sym, interval)
+        df = new if old.empty else pd.concat([old, new])
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        if interval in RETENTION and not df.empty:
+            df = df[df.index >= _now(df.index[-1]) - RETENTION[interval]]
+
+        path = self.path_for(y_sym, interval)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f: df.to_parquet(f)
+        os.replace(tmp, path)
+        with self._lock:
+            self._frames[(y_sym, interval)] = df
+        return df
+
+    def update(self, y_syms, interval="5m"):
+        """Delta-fetches every symbol: cold ones get COLD_PERIOD, warm ones only the gap.
+
+        Warm symbols are batched by how recent their last bar is, so one stale
+        symbol doesn't widen the window for the rest. A gap older than what
+        upstream still serves for the interval (MAX_LOOKBACK) is fetched cold.
+        """
+        y_syms = list(y_syms)
+        last = {s: self.last_timestamp(s, interval) for s in y_syms}
+        limit = MAX_LOOKBACK.get(interval)
+        cold = [s for s in y_syms if last[s] is None or (limit is not None and last[s] < _now(last[s]) - limit)]
+        warm = {s: last[s] for s in y_syms if s not in cold}
+
+        fetched = {}
+        if cold:
+            fetched.update(market_data.fetch_universe(self.provider, cold, primary=(COLD_PERIOD.get(interval, "5d"), interval), fallback=None))
+        for group in _group_by_last(warm, GROUP_SPAN.get(interval, pd.Timedelta(days=1))):
+            # One batch from the group's oldest gap; append() drops the overlap
+            start = warm[group[0]]
+            fetched.update(market_data.fetch_universe(self.provider, group, primary=(None, interval), fallback=None, start=start))
+
+        for s, df in fetched.items():
+            try:
+                self.append(s, interval, df)
+            except Exception as e:
+                print(f"   ❌ Bar store {s} {interval}: {e}")
@@ -0,0 +1,369 @@
+import os
+import io
+import ast
+import sys
+import json
+import time
+import argparse
+import datetime
+import platform
+import tempfile
+import threading
+import statistics
+import subprocess
+import tracemalloc
+import contextlib
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import numpy as np
+import pandas as pd
+
+# Offline benchmarks for the data and render paths.
+#
+#   python benchmark.py                          # synthetic fixtures, default scales
+#   python benchmark.py --symbols 20,200 --cot-years 1,10 --latency 0.05
+#   python benchmark.py --record data/fixtures   # record real yfinance bars once (needs network)
+#   python benchmark.py --fixtures data/fixtures --out bench.json --compare old.json
+#
+# Every case runs in its own temp working dir, so data/, the shared cache and
+# cot_live.json of the checkout are never touched.
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SYMBOLS = "20,100"
+DEFAULT_COT_YEARS = "1,5"
+DEFAULT_REPEAT = 3
+BAR_SHAPE = {"5m": ("5min", 600), "1h": ("1h", 720), "1d": ("1D", 365)}    # pandas freq, bars per symbol
+NOISE_MARKETS = 40          # non-matching markets per COT week, like the real files
+COT_COLUMNS = 40            # enough for every column index parse_report reads
+
+
+def ticker_map():
+    """TICKER_MAP as declared in app.py (read with ast: importing app would render the page)"""
+    with open(os.path.join(REPO, "app.py"), "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "TICKER_MAP":
+            return ast.literal_eval(node.value)
+    raise RuntimeError("TICKER_MAP not found in app.py")
+
+
+def universe(n):
+    """First n dashboard symbols, padded with synthetic FX pairs past the real 20"""
+    base = list(ticker_map().items())
+    extra = [(f"SYN {i:03d}", f"SYN{i:03d}=X") for i in range(max(0, n - len(base)))]
+    return dict((base + extra)[:n])
+
+
+# ================= FIXTURES =================
+def make_bar_fixtures(fixture_dir, y_syms, seed=7):
+    """Random-walk OHLC CSVs in the FixtureProvider layout, ending at the current 5m bar"""
+    from market_data import FixtureProvider
+    provider = FixtureProvider(fixture_dir)
+    os.makedirs(fixture_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.now(tz="UTC").floor("5min")
+    for y_sym in y_syms:
+        for interval, (freq, n) in BAR_SHAPE.items():
+            path = provider.path_for(y_sym, interval)
+            if os.path.exists(path):
+                continue
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+            wick = close * np.abs(rng.normal(0, 0.001, n))
+            index = pd.date_range(end=end.floor(freq), periods=n, freq=freq)
+            pd.DataFrame({"Open": np.r_[close[0], close[:-1]], "High": close + wick, "Low": close - wick,
+                          "Close": close, "Volume": 0}, index=index).to_csv(path)
+
+
+def record_bar_fixtures(fixture_dir, y_syms):
+    """Saves real yfinance bars (cold-start periods) as fixtures for later offline replays"""
+    from market_data import YahooProvider, FixtureProvider
+    from bar_store import COLD_PERIOD
+    live, layout = YahooProvider(), FixtureProvider(fixture_dir)
+    os.makedirs(fixture_dir, exist_ok=True)
+    for y_sym in y_syms:
+        for interval, period in COLD_PERIOD.items():
+            try:
+                df = live.history(y_sym, period=period, interval=interval)
+                df[["Open", "High", "Low", "Close", "Volume"]].to_csv(layout.path_for(y_sym, interval))
+                print(f"   ✅ {y_sym} {interval}: {len(df)} bars")
+            except Exception as e:
+                print(f"   ❌ {y_sym} {interval}: {e}")
+
+
+def make_cot_fixtures(cot_dir, years, seed=7):
+    """Weekly f_disagg.txt / FinFutWk.txt plus `years` of archive history per report"""
+    from cot_fetcher import ASSET_CONFIG, REPORTS
+    os.makedirs(cot_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    names = [" ".join(keywords) + " - SYNTHETIC EXCHANGE" for keywords in ASSET_CONFIG.values()]
+    names += [f"NOISE MARKET {i} - SYNTHETIC EXCHANGE" for i in range(NOISE_MARKETS)]
+    last = pd.Timestamp.now().normalize() - pd.Timedelta(days=(pd.Timestamp.now().weekday() - 1) % 7)   # Tuesday
+    dates = pd.date_range(end=last, periods=max(1, int(52 * years)), freq="7D")
+
+    def lines(week_dates):
+        out = []
+        for d in week_dates:
+            numbers = rng.integers(0, 50000, size=(len(names), COT_COLUMNS - 5))
+            for name, row in zip(names, numbers):
+                out.append(f'"{name}",{d:%y%m%d},{d:%Y-%m-%d},000000,SYN  ,' + ",".join(map(str, row)))
+        return out
+
+    paths = {}
+    for report_type, fname in REPORTS.items():
+        with open(os.path.join(cot_dir, fname), "w") as f: f.write("\n".join(lines(dates[-1:])) + "\n")
+        archive = os.path.join(cot_dir, f"history_{fname}")
+        with open(archive, "w") as f: f.write("header\n" + "\n".join(lines(dates)) + "\n")
+        paths[report_type] = (os.path.join(cot_dir, fname), archive)
+    return paths
+
+
+class SlowHandler(SimpleHTTPRequestHandler):
+    """Static file server with a fixed synthetic round-trip, standing in for cftc.gov"""
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(directory, latency):
+    handler = type("Handler", (SlowHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# ================= MEASUREMENT =================
+@contextlib.contextmanager
+def workdir():
+    """Fresh cwd (data/, cot_live.json, shared cache) for one case"""
+    import shared_cache
+    old = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="alphaedge-bench-") as tmp:
+        os.chdir(tmp)
+        shared_cache.CACHE_PATH = os.path.join(tmp, "data", "shared_cache.sqlite")
+        try:
+            yield tmp
+        finally:
+            os.chdir(old)
+
+
+def timed(fn, trace=False):
+    """(seconds, peak MB or None) for one quiet call of fn"""
+    if trace: tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        t = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t
+    peak = None
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def result(name, cold, warm, peak, items=None, **params):
+    out = {"name": name, **params, "cold_s": round(cold, 4), "warm_s": round(statistics.median(warm), 4) if warm else None,
+           "peak_mb": round(peak, 2) if peak is not None else None}
+    if items:
+        out["items"] = items
+        out["rows_per_s"] = round(items / cold, 1) if cold else None
+    print(f"   ⏱️ {name} {params}: cold {out['cold_s']}s · warm {out['warm_s']}s · peak {out['peak_mb']} MB")
+    return out
+
+
+# ================= CASES =================
+def bench_dashboard(fixture_dir, n, latency, repeat):
+    """MarketRefresher.refresh(): cold = empty store; warm = restart with bars + indicator state on disk"""
+    import shared_cache
+    import sentiment
+    from market_data import FixtureProvider
+    from refresher import MarketRefresher
+    tickers = universe(n)
+    provider = FixtureProvider(fixture_dir, latency)
+
+    def cold_run(trace=False):
+        with workdir():
+            sentiment._cache.update(key=None)
+            return timed(lambda: MarketRefresher(tickers, provider).refresh(), trace)
+
+    cold, _ = cold_run()
+    _, peak = cold_run(trace=True)
+    warm = []
+    with workdir() as tmp:
+        sentiment._cache.update(key=None)
+        MarketRefresher(tickers, provider).refresh()
+        for i in range(repeat):
+            shared_cache.CACHE_PATH = os.path.join(tmp, "data", f"shared_cache_{i}.sqlite")   # expire the shared entry
+            warm.append(timed(lambda: MarketRefresher(tickers, provider).refresh())[0])
+    return result("dashboard", cold, warm, peak, items=n, symbols=n, latency=latency)
+
+
+def bench_sentiment(fixture_dir, n, latency, repeat):
+    """get_sentiment_map(): cold = fetch + compute; warm = TTL-cache hit"""
+    import sentiment
+    from market_data import FixtureProvider
+    y_syms = list(universe(n).values())
+    provider = FixtureProvider(fixture_dir, latency)
+    with workdir():
+        sentiment._cache.update(key=None)
+        cold, _ = timed(lambda: sentiment.get_sentiment_map(provider, y_syms, ttl=0))
+        _, peak = timed(lambda: sentiment.get_sentiment_map(provider, y_syms, ttl=0), trace=True)
+        sentiment.get_sentiment_map(provider, y_syms)
+        warm = [timed(lambda: sentiment.get_sentiment_map(provider, y_syms))[0] for _ in range(repeat)]
+    return result("sentiment", cold, warm, peak, items=n, symbols=n, latency=latency)
+
+
+def bench_cot_weekly(base_url, paths, latency, repeat):
+    """cot_fetcher.fetch_and_process() over HTTP for both weekly files"""
+    import cot_fetcher
+    out = []
+    for report_type, fname in cot_fetcher.REPORTS.items():
+        url = f"{base_url}/{fname}"
+        run = lambda: cot_fetcher.fetch_and_process(url, report_type)
+        cold, _ = timed(run)
+        _, peak = timed(run, trace=True)
+        warm = [timed(run)[0] for _ in range(repeat)]
+        with open(paths[report_type][0]) as f: rows = sum(1 for _ in f)
+        out.append(result("cot_fetch_and_process", cold, warm, peak, items=rows, report=report_type, latency=latency))
+    return out
+
+
+def bench_cot_history(paths, years, repeat):
+    """Archive parse (latest_only=False) + CotHistory rolling stats for `years` of weeks"""
+    import cot_fetcher
+    from cot_history import CotHistory
+    out = []
+    for report_type, (_, archive) in paths.items():
+        def run():
+            with workdir():
+                CotHistory().append(cot_fetcher.parse_report(archive, report_type, latest_only=False, skiprows=1))
+        cold, _ = timed(run)
+        _, peak = timed(run, trace=True)
+        warm = [timed(run)[0] for _ in range(repeat)]
+        with open(archive) as f: rows = sum(1 for _ in f) - 1
+        out.append(result("cot_history", cold, warm, peak, items=rows, report=report_type, years=years))
+    return out
+
+
+def bench_app(fixture_dir, latency, repeat):
+    """Whole-page reruns of app.py through Streamlit's headless AppTest"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    os.environ["ALPHAEDGE_FIXTURES"] = fixture_dir
+    os.environ["ALPHAEDGE_FIXTURE_LATENCY"] = str(latency)
+    out = []
+    with workdir() as tmp:
+        # Real assets and quotes, throwaway data/
+        for name in ("static", ".streamlit", "live_prices.json", "cot_live.json"):
+            if os.path.exists(os.path.join(REPO, name)):
+                os.symlink(os.path.join(REPO, name), os.path.join(tmp, name))
+        st.cache_resource.clear()
+        at = AppTest.from_file(os.path.join(REPO, "app.py"), default_timeout=120)
+        cold, _ = timed(at.run)
+        if at.exception:
+            print(f"   ❌ app.py raised: {[e.message for e in at.exception]}")
+        warm = [timed(at.run)[0] for _ in range(repeat)]
+        out.append(result("app_rerun", cold, warm, None, tab="dashboard", latency=latency))
+
+        at.session_state["main_tab"] = "  📊 COT DATA  "
+        cold, _ = timed(at.run)
+        warm = [timed(at.run)[0] for _ in range(repeat)]
+        out.append(result("app_rerun", cold, warm, None, tab="cot", latency=latency))
+    return out
+
+
+# ================= REPORT =================
+def _commit():
+    try:
+        return subprocess.run(["git", "-C", REPO, "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _case_key(r):
+    return tuple(sorted((k, v) for k, v in r.items() if k not in ("cold_s", "warm_s", "peak_mb", "items", "rows_per_s")))
+
+
+def compare(report, baseline_path):
+    """Prints new/old ratios for every case present in both reports"""
+    with open(baseline_path, "r") as f: baseline = json.load(f)
+    old = {_case_key(r): r for r in baseline["results"]}
+    print(f"\n📊 vs {baseline.get('commit')} ({baseline_path})")
+    for r in report["results"]:
+        prev = old.get(_case_key(r))
+        if prev is None:
+            continue
+        parts = []
+        for metric in ("cold_s", "warm_s", "peak_mb"):
+            if r.get(metric) and prev.get(metric):
+                parts.append(f"{metric} x{r[metric] / prev[metric]:.2f}")
+        print(f"   {r['name']} {dict(k for k in _case_key(r) if k[0] != 'name')}: {' · '.join(parts)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline AlphaEdge benchmarks (JSON report)")
+    parser.add_argument("--fixtures", help="bar fixture dir (default: synthetic, generated in a temp dir)")
+    parser.add_argument("--record", metavar="DIR", help="record live yfinance bars for TICKER_MAP into DIR and exit")
+    parser.add_argument("--symbols", default=DEFAULT_SYMBOLS, help="comma-separated universe sizes")
+    parser.add_argument("--cot-years", default=DEFAULT_COT_YEARS, help="comma-separated years of COT history")
+    parser.add_argument("--latency", type=float, default=0.0, help="synthetic seconds per upstream call")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--skip-app", action="store_true", help="skip the AppTest page reruns")
+    parser.add_argument("--out", default="benchmark.json", help="where to write the JSON report")
+    parser.add_argument("--compare", metavar="JSON", help="earlier report to compare against")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO)
+    if args.record:
+        record_bar_fixtures(args.record, ticker_map().values())
+        return
+
+    sizes = [int(s) for s in args.symbols.split(",")]
+    years = [float(y) for y in args.cot_years.split(",")]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="alphaedge-fixtures-") as scratch:
+        fixture_dir = args.fixtures or os.path.join(scratch, "bars")
+        print(f"🧪 Bar fixtures: {fixture_dir}")
+        make_bar_fixtures(fixture_dir, universe(max(sizes)).values())   # only fills in what is missing
+
+        for n in sizes:
+            results.append(bench_dashboard(fixture_dir, n, args.latency, args.repeat))
+            results.append(bench_sentiment(fixture_dir, n, args.latency, args.repeat))
+
+        for y in years:
+            cot_dir = os.path.join(scratch, f"cot_{y:g}y")
+            paths = make_cot_fixtures(cot_dir, y)
+            server, base_url = serve(cot_dir, args.latency)
+            try:
+                if y == years[0]:
+                    results.extend(bench_cot_weekly(base_url, paths, args.latency, args.repeat))
+                    if not args.skip_app:
+                        os.environ["COT_BASE_URL"] = base_url   # the COT tab's auto refresh stays local
+                        import cot_fetcher
+                        cot_fetcher.COT_BASE_URL = base_url
+                        results.extend(bench_app(fixture_dir, args.latency, args.repeat))
+                results.extend(bench_cot_history(paths, y, args.repeat))
+            finally:
+                server.shutdown()
+
+    report = {
+        "commit": _commit(),
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"symbols": sizes, "cot_years": years, "latency": args.latency, "repeat": args.repeat,
+                   "fixtures": "recorded" if args.fixtures else "synthetic"},
+        "results": results,
+    }
+    with open(args.out, "w") as f: json.dump(report, f, indent=2)
+    print(f"✅ Report written to {args.out}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,18 @@
 import pandas as pd
 import requests
-import io
+import re
+import os
 import json
+import hashlib
+import argparse
+import tempfile
+import threading
+import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cot_history import CotHistory
+import shared_cache
+import metrics
 
 # --- ASSET CONFIGURATION ---
 ASSET_CONFIG = {
@@ -32,86 +42,130 @@ ASSET_CONFIG = {
     "USOil": ["CRUDE", "OIL", "LIGHT"],
 }
 
+# --- SOURCES ---
+# Point COT_BASE_URL at a local server (e.g. `python -m http.server` in a folder
+# holding f_disagg.txt / FinFutWk.txt) to run the whole refresh offline.
+COT_BASE_URL = os.environ.get("COT_BASE_URL", "https://www.cftc.gov/dea/newcot")
+REPORTS = {"Commodities": "f_disagg.txt", "Financials": "FinFutWk.txt"}
+ARCHIVE_URL = "https://www.cftc.gov/files/dea/history/{name}_{year}.zip"
+ARCHIVES = {"Commodities": "fut_disagg_txt", "Financials": "fut_fin_txt"}
+HTTP_STATE_PATH = os.path.join("data", "cot_http.json")
+LIVE_PATH = "cot_live.json"
+UPDATE_WAIT = 300           # longest a replica waits on another one's in-flight update
+
+# --- REPORT LAYOUT (integer column positions, the weekly files have no header) ---
+# 0: Name, 2: Date, 7: Open Interest, 24: Change in OI
+IDX_NAME = 0
+IDX_DATE = 2
+IDX_OI = 7
+IDX_DOI = 24
+
+REPORT_COLUMNS = {
+    # Disaggregated Report: 12/13 Managed Money Long/Short, 29/30 their weekly change
+    "Commodities": {"long": 12, "short": 13, "dlong": 29, "dshort": 30},
+    # TFF Report: 14/15 Leveraged Funds Long/Short, 31/32 their weekly change
+    "Financials": {"long": 14, "short": 15, "dlong": 31, "dshort": 32},
+}
+
+CHUNK_ROWS = 5000
+
+# All keywords must appear in the market name; one lookahead regex per symbol
+ASSET_PATTERNS = {
+    symbol: re.compile("".join(f"(?=.*{re.escape(k)})" for k in keywords))
+    for symbol, keywords in ASSET_CONFIG.items()
+}
+
+
+def _match_symbols(names, known):
+    """Symbols for each distinct market name (memoized in `known` across chunks)"""
+    for name in names:
+        if name not in known:
+            known[name] = [sym for sym, pat in ASSET_PATTERNS.items() if pat.match(name)] or None
+    return known
+
+
+def parse_report(source, report_type, latest_only=True, skiprows=0, chunksize=CHUNK_ROWS):
+    """Streams a CFTC comma file and returns one row per (symbol, date).
+
+    Only the 9 columns we use are parsed, with fixed dtypes, CHUNK_ROWS lines at a
+    time, so memory stays flat for the weekly files and the multi-year archives
+    alike (archives carry a header line: pass skiprows=1). With latest_only the
+    rows of older report dates are dropped as soon as a newer date shows up.
+    """
+    cols = REPORT_COLUMNS[report_type]
+    numeric = [IDX_OI, IDX_DOI, cols["long"], cols["short"], cols["dlong"], cols["dshort"]]
+    # Read as text and coerced per chunk: a "." or " ." (or any junk) blanks that one
+    # field, and CotHistory drops the row, instead of failing the whole report
+    dtypes = {i: "str" for i in [IDX_NAME, IDX_DATE] + numeric}
+
+    reader = pd.read_csv(source, header=None, usecols=[IDX_NAME, IDX_DATE] + numeric, dtype=dtypes,
+                         skiprows=skiprows, chunksize=chunksize,
+                         on_bad_lines="skip", encoding="latin-1")
+
+    known = {}
+    parts = []
+    latest = None
+    for chunk in reader:
+        chunk[numeric] = chunk[numeric].apply(pd.to_numeric, errors="coerce")
+        chunk[IDX_DATE] = pd.to_datetime(chunk[IDX_DATE], format="%Y-%m-%d", errors="coerce")
+        if latest_only:
+            chunk_max = chunk[IDX_DATE].max()
+            if pd.isna(chunk_max) or (latest is not None and chunk_max < latest):
+                continue
+            if latest is None or chunk_max > latest:
+                latest, parts = chunk_max, []
+            chunk = chunk[chunk[IDX_DATE] == latest]
+
+        names = chunk[IDX_NAME].str.upper()
+        _match_symbols(names.dropna().unique(), known)
+        chunk = chunk.assign(symbol=names.map(known)).dropna(subset=["symbol"])
+        if not chunk.empty:
+            parts.append(chunk.explode("symbol"))
+
+    if not parts:
+        return pd.DataFrame()
+
+    df = pd.concat(parts, ignore_index=True).dropna(subset=[IDX_DATE])
+    # First matching row in file order wins, like the old per-symbol scan
+    df = df.drop_duplicates(subset=["symbol", IDX_DATE], keep="first")
+    order = {sym: i for i, sym in enumerate(ASSET_CONFIG)}
+    df = df.assign(_order=df["symbol"].map(order)).sort_values([IDX_DATE, "_order"], kind="stable")
+
+    longs, shorts, oi = df[cols["long"]], df[cols["short"]], df[IDX_OI]
+    net = longs - shorts
+    total = longs + shorts
+    return pd.DataFrame({
+        "symbol": df["symbol"], "date": df[IDX_DATE],
+        "long_pos": longs, "short_pos": shorts,
+        "change_long": df[cols["dlong"]], "change_short": df[cols["dshort"]],
+        "long_pct": (longs / total * 100).where(total > 0, 0.0),
+        "short_pct": (shorts / total * 100).where(total > 0, 0.0),
+        "net_pct": (net / oi * 100).where(oi > 0, 0.0), "net_pos": net,
+        "open_int": oi, "change_oi": df[IDX_DOI],
+    }).reset_index(drop=True)
+
+
 def fetch_and_process(url, report_type):
-    print(f"⏳ Downloading {report_type} (No Headers Mode)...")
+    print(f"⏳ Downloading {report_type} (Streaming Mode)...")
     headers = {"User-Agent": "Mozilla/5.0"}
     extracted = {}
-    
+
     try:
-        r = requests.get(url, headers=headers, timeout=30)
-        
-        # Read without header (header=None) so the first row is data, not names
-        df = pd.read_csv(io.StringIO(r.text), header=None, low_memory=False, on_bad_lines='skip')
-        
-        # --- COLUMN MAPPING (Based on your Debug Output) ---
-        # 0: Name, 2: Date, 7: Open Interest, 24: Change in OI
-        
-        idx_name = 0
-        idx_date = 2
-        idx_oi = 7
-        idx_doi = 24
-        
-        if report_type == "Commodities":
-            # Disaggregated Report (Wheat Example)
-            # 12: Managed Money Long, 13: Managed Money Short
-            idx_long = 12
-            idx_short = 13
-            # Calculated Offsets for Change (Indices 29/30 based on +17 shift pattern)
-            idx_dlong = 29
-            idx_dshort = 30
-            
-        else: # Financials
-            # TFF Report (CAD Example)
-            # 14: Leveraged Funds Long, 15: Leveraged Funds Short
-            idx_long = 14
-            idx_short = 15
-            # Calculated Offsets for Change
-            idx_dlong = 31
-            idx_dshort = 32
-
-        # Filter for Latest Date
-        df[idx_date] = pd.to_datetime(df[idx_date], errors='coerce')
-        latest_date = df[idx_date].max()
-        print(f"   📅 {report_type} Date: {latest_date.date()}")
-        df = df[df[idx_date] == latest_date]
-        
-        # Convert Name to Uppercase
-        df[idx_name] = df[idx_name].astype(str).str.upper()
-        
-        print(f"   🔍 Scanning {report_type}...")
-
-        for symbol, keywords in ASSET_CONFIG.items():
-            # Check keywords against Column 0 (Name)
-            mask = df[idx_name].apply(lambda x: all(k in x for k in keywords))
-            row = df[mask]
-            
-            if not row.empty:
-                r = row.iloc[0]
-                try:
-                    # EXTRACT BY INTEGER INDEX
-                    longs = float(r.iloc[idx_long])
-                    shorts = float(r.iloc[idx_short])
-                    d_long = float(r.iloc[idx_dlong])
-                    d_short = float(r.iloc[idx_dshort])
-                    oi = float(r.iloc[idx_oi])
-                    d_oi = float(r.iloc[idx_doi])
-
-                    # Math
-                    net = longs - shorts
-                    total = longs + shorts
-                    l_pct = (longs / total * 100) if total > 0 else 0
-                    s_pct = (shorts / total * 100) if total > 0 else 0
-                    net_chg = (net / oi * 100) if oi > 0 else 0
-
-                    extracted[symbol] = {
-                        "long_pos": longs, "short_pos": shorts,
-                        "change_long": d_long, "change_short": d_short,
-                        "long_pct": l_pct, "short_pct": s_pct,
-                        "net_pct": net_chg, "net_pos": net,
-                        "open_int": oi, "change_oi": d_oi
-                    }
-                except: pass
-        
+        with requests.get(url, headers=headers, timeout=30, stream=True) as r:
+            r.raise_for_status()
+            r.raw.decode_content = True
+            # Streaming: download and parse overlap, so this is the time for both
+            with metrics.timer("cot_parse_seconds", report=report_type):
+                df = parse_report(r.raw, report_type)
+            metrics.inc("cot_bytes_total", r.raw.tell(), report=report_type)
+
+        if df.empty:
+            print(f"   ⚠️ No matching assets in {report_type}")
+            return {}
+
+        print(f"   📅 {report_type} Date: {df['date'].iloc[0].date()}")
+        extracted = df.drop(columns="date").set_index("symbol").to_dict(orient="index")
+
         print(f"   ✅ Found {len(extracted)} assets in {report_type}")
         return extracted
 
@@ -119,23 +173,216 @@ def fetch_and_process(url, report_type):
         print(f"   ❌ Error in {report_type}: {e}")
         return {}
 
-def update_cot_data():
-    all_data = {}
-    
-    # 1. COMMODITIES
-    c_data = fetch_and_process("https://www.cftc.gov/dea/newcot/f_disagg.txt", "Commodities")
-    all_data.update(c_data)
-    
-    # 2. FINANCIALS
-    f_data = fetch_and_process("https://www.cftc.gov/dea/newcot/FinFutWk.txt", "Financials")
-    all_data.update(f_data)
-
-    if all_data:
-        with open("cot_live.json", "w") as f:
-            json.dump(all_data, f)
-        print(f"✅ SUCCESS! Saved {len(all_data)} assets.")
-    else:
+# --- CONDITIONAL DOWNLOADS ---
+def _load_http_state():
+    if os.path.exists(HTTP_STATE_PATH):
+        with open(HTTP_STATE_PATH, "r") as f: return json.load(f)
+    return {}
+
+def _save_http_state(state):
+    os.makedirs(os.path.dirname(HTTP_STATE_PATH), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(HTTP_STATE_PATH), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, HTTP_STATE_PATH)
+
+def last_checked():
+    """When CFTC last answered every report (new data or not), or None"""
+    try:
+        return _load_http_state().get("checked_at")
+    except (OSError, ValueError):
+        return None
+
+def download_if_changed(url, state):
+    """Streams url to a temp file unless it is unchanged since the last fetch.
+
+    Sends If-None-Match / If-Modified-Since from the stored validators and, for
+    servers that ignore them, compares a SHA-256 of the body. Returns
+    (path, validators); path is None when there is nothing new.
+    """
+    prev = state.get(url, {})
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if prev.get("etag"): headers["If-None-Match"] = prev["etag"]
+    if prev.get("last_modified"): headers["If-Modified-Since"] = prev["last_modified"]
+
+    fname = os.path.basename(url)
+    t = time.perf_counter()
+    with requests.get(url, headers=headers, timeout=30, stream=True) as r:
+        if r.status_code == 304:
+            metrics.inc("cot_http_total", file=fname, result="not_modified")
+            return None, prev
+        r.raise_for_status()
+        digest = hashlib.sha256()
+        size = 0
+        fd, path = tempfile.mkstemp(suffix=os.path.splitext(url)[1])
+        with os.fdopen(fd, "wb") as f:
+            for block in r.iter_content(chunk_size=1 << 16):
+                digest.update(block)
+                f.write(block)
+                size += len(block)
+        validators = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified"), "sha256": digest.hexdigest()}
+    metrics.observe("cot_download_seconds", time.perf_counter() - t, file=fname)
+    metrics.inc("cot_bytes_total", size, file=fname)
+
+    if validators["sha256"] == prev.get("sha256"):
+        metrics.inc("cot_http_total", file=fname, result="unchanged")
+        os.remove(path)
+        return None, validators
+    metrics.inc("cot_http_total", file=fname, result="changed")
+    return path, validators
+
+def _write_live(history):
+    """Writes cot_live.json via temp file + rename, so readers never see half a file"""
+    latest = history.latest(order=list(ASSET_CONFIG))
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(LIVE_PATH)), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(latest, f)
+    os.replace(tmp, LIVE_PATH)
+    return latest
+
+def _fetch_report(report_type, fname, state):
+    url = f"{COT_BASE_URL}/{fname}"
+    print(f"⏳ Checking {report_type}...")
+    path, validators = download_if_changed(url, state)
+    if path is None:
+        return url, None, validators
+    try:
+        with metrics.timer("cot_parse_seconds", report=report_type):
+            return url, parse_report(path, report_type), validators
+    finally:
+        os.remove(path)
+
+def update_cot_data(force=False, progress=None):
+    """Appends any newly published week to the history and rewrites cot_live.json.
+
+    Both reports are downloaded and parsed concurrently. `progress`, if given,
+    is called as progress(fraction, message) while the job runs. Replicas
+    coalesce only while an update is in flight: the others wait for its
+    result instead of hitting CFTC themselves, but nothing is reused after
+    it finishes, so a later Refresh always checks CFTC again.
+    """
+    report = progress or (lambda fraction, message: None)
+    if force:
+        return _update_cot_data(force, report)
+    return shared_cache.get_or_compute(
+        "cot:update", 0, lambda: _update_cot_data(force, report),
+        stale_ok=False, wait=UPDATE_WAIT,
+        on_wait=lambda: report(0.05, "Another worker is refreshing, waiting..."))
+
+
+def _update_cot_data(force, report):
+    history = CotHistory()
+    # Validators only mean something if the history they describe is still there
+    state = {} if force or history.df.empty else _load_http_state()
+    changed = False
+    failed = False
+
+    report(0.05, "Downloading CFTC reports...")
+    with ThreadPoolExecutor(max_workers=len(REPORTS)) as pool:
+        futures = {pool.submit(_fetch_report, rt, fname, dict(state)): rt for rt, fname in REPORTS.items()}
+        for done, fut in enumerate(as_completed(futures), start=1):
+            report_type = futures[fut]
+            try:
+                url, rows, validators = fut.result()
+                if rows is None:
+                    print(f"   ⏭️ {report_type} unchanged since last fetch")
+                    state[url] = validators
+                elif rows.empty:
+                    print(f"   ⚠️ No matching assets in {report_type}")
+                else:
+                    print(f"   📅 {report_type} Date: {rows['date'].iloc[0].date()} ({len(rows)} assets)")
+                    history.append(rows)
+                    state[url] = validators
+                    changed = True
+            except Exception as e:
+                print(f"   ❌ Error in {report_type}: {e}")
+                failed = True
+            report(0.05 + 0.8 * done / len(futures), f"{report_type} done ({done}/{len(futures)})")
+
+    if not failed:
+        # The scheduler reads this: a 304 before CFTC publishes still counts as a check
+        state["checked_at"] = time.time()
+    if changed:
+        history.save()
+        _save_http_state(state)  # after the history, so a crash never skips a week
+    elif not failed or os.path.exists(HTTP_STATE_PATH):
+        _save_http_state(state)
+
+    if history.df.empty:
         print("❌ Fatal: No assets found.")
+        report(1.0, "No assets found")
+        return False
+    if changed or not os.path.exists(LIVE_PATH):
+        latest = _write_live(history)
+        print(f"✅ SUCCESS! Saved {len(latest)} assets.")
+        report(1.0, f"Saved {len(latest)} assets")
+    else:
+        print("✅ Already up to date.")
+        report(1.0, "Already up to date")
+    return True
+
+class RefreshJob:
+    """Runs update_cot_data on a background thread; one per process, polled by the COT tab"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self.progress = 0.0
+        self.message = ""
+        self.ok = None
+        self.finished_at = None
+
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, force=False):
+        """Starts a refresh unless one is already running; returns True if it started"""
+        with self._lock:
+            if self.running():
+                return False
+            self.progress, self.message, self.ok = 0.0, "Starting...", None
+            self._thread = threading.Thread(target=self._run, args=(force,), name="cot-refresh", daemon=True)
+            self._thread.start()
+            return True
+
+    def _report(self, fraction, message):
+        self.progress, self.message = fraction, message
+
+    def _run(self, force):
+        try:
+            with metrics.timer("cot_update_seconds"):
+                self.ok = update_cot_data(force=force, progress=self._report)
+        except Exception as e:
+            self.ok, self.message = False, f"Failed: {e}"
+        metrics.inc("cot_updates_total", result="ok" if self.ok else "failed")
+        self.progress = 1.0
+        self.finished_at = time.time()
+
+def backfill(years):
+    """Loads the CFTC yearly archives into the history so the 26/52/156-week stats have depth"""
+    history = CotHistory()
+    for report_type, name in ARCHIVES.items():
+        for year in years:
+            url = ARCHIVE_URL.format(name=name, year=year)
+            print(f"⏳ Backfilling {report_type} {year}...")
+            try:
+                path, _ = download_if_changed(url, {})
+                try:
+                    rows = parse_report(path, report_type, latest_only=False, skiprows=1)
+                finally:
+                    os.remove(path)
+                history.append(rows)
+                print(f"   ✅ {len(rows)} rows")
+            except Exception as e:
+                print(f"   ❌ Error in {report_type} {year}: {e}")
+    history.save()
+    _write_live(history)
 
 if __name__ == "__main__":
-    update_cot_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Refresh COT positioning data")
+    parser.add_argument("--backfill", nargs="+", type=int, metavar="YEAR", help="load CFTC yearly archives first")
+    parser.add_argument("--force", action="store_true", help="ignore ETag/Last-Modified/hash and re-download")
+    args = parser.parse_args()
+    if args.backfill:
+        backfill(args.backfill)
+    update_cot_data(force=args.force)
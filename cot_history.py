@@ -0,0 +1,67 @@
+import os
+import math
+import tempfile
+import pandas as pd
+
+HISTORY_PATH = os.path.join("data", "cot_history.parquet")
+WINDOWS = (26, 52, 156)     # weeks: ~6 months, 1 year, 3 years
+STALE_AFTER = pd.Timedelta(days=7)
+# Weekly numbers every row needs; CFTC prints "." when one is missing
+RAW_COLUMNS = ["long_pos", "short_pos", "change_long", "change_short", "open_int", "change_oi"]
+
+
+class CotHistory:
+    """Weekly COT positioning for every tracked symbol, one row per (symbol, date).
+
+    Rolling COT index (where this week's net position sits between the window's
+    min and max, 0-100) and percentile of net position are recomputed on every
+    append and stored alongside the raw numbers.
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self.df = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+
+    def append(self, rows):
+        if rows is None:
+            return self.df
+        # An asset with a blank position or change is skipped for that week, like the old scanner did
+        rows = rows.dropna(subset=RAW_COLUMNS)
+        if rows.empty:
+            return self.df
+        df = rows if self.df.empty else pd.concat([self.df, rows], ignore_index=True)
+        df = df.drop_duplicates(subset=["symbol", "date"], keep="last")
+        self.df = self.compute_stats(df.sort_values(["symbol", "date"], ignore_index=True))
+        return self.df
+
+    @staticmethod
+    def compute_stats(df):
+        net = df.groupby("symbol", sort=False)["net_pos"]
+        for w in WINDOWS:
+            lo = net.transform(lambda s: s.rolling(w).min())
+            hi = net.transform(lambda s: s.rolling(w).max())
+            span = (hi - lo).where(hi > lo)
+            df[f"cot_index_{w}"] = (df["net_pos"] - lo) / span * 100
+            df[f"pctile_{w}"] = net.transform(lambda s: s.rolling(w).rank(pct=True) * 100)
+        return df
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f: self.df.to_parquet(f, index=False)
+        os.replace(tmp, self.path)
+
+    def latest(self, order=None):
+        """{symbol: {...}} for the current week, JSON-safe (NaN -> None)"""
+        if self.df.empty:
+            return {}
+        last = self.df.groupby("symbol", sort=False).tail(1)
+        last = last[last["date"] >= self.df["date"].max() - STALE_AFTER]
+        if order:
+            rank = {sym: i for i, sym in enumerate(order)}
+            last = last.assign(_order=last["symbol"].map(rank)).sort_values("_order").drop(columns="_order")
+        out = {}
+        for rec in last.drop(columns="date").to_dict(orient="records"):
+            sym = rec.pop("symbol")
+            out[sym] = {k: (None if isinstance(v, float) and math.isnan(v) else v) for k, v in rec.items()}
+        return out
@@ -0,0 +1,204 @@
+import time
+import warnings
+import threading
+import numpy as np
+
+CURRENCIES = ["EUR", "USD", "JPY", "GBP", "CHF", "AUD", "CAD", "NZD", "ZAR"]
+ANCHOR = "USD"              # log level pinned to 0, every other level is relative to it
+RESOLVE_EVERY = 1000        # incremental updates between exact re-solves (float drift)
+MAX_QUOTE_AGE = 300         # seconds; a pair not quoted for longer stops pulling the levels
+MAX_DISAGREEMENT = 0.05     # log distance from the rate the other pairs imply before a quote counts as off-scale
+MAX_SESSION_MOVE = 0.10     # a session open further than this from the live quote came from another source
+
+
+def parse_pair(symbol):
+    """'EUR/JPY' -> ('EUR', 'JPY'); None for anything that isn't a currency pair"""
+    parts = symbol.split("/")
+    return (parts[0], parts[1]) if len(parts) == 2 and len(parts[0]) == 3 and len(parts[1]) == 3 else None
+
+
+def _log_price(price):
+    try:
+        y = np.log(float(price))
+    except (TypeError, ValueError):
+        return None
+    return y if np.isfinite(y) else None
+
+
+def _implied(graph, base, quote):
+    """log(BASE/QUOTE) along any chain of pairs in graph, None if there is none"""
+    seen, stack = {base: 0.0}, [base]
+    while stack:
+        ccy = stack.pop()
+        for other, y in graph.get(ccy, ()):
+            if other not in seen:
+                seen[other] = seen[ccy] + y
+                stack.append(other)
+    return seen.get(quote)
+
+
+def consistent(quotes, tolerance=MAX_DISAGREEMENT):
+    """Keeps {(base, quote): log price} entries, in priority order, that agree with those kept before them.
+
+    Sources on different scales (a recorded fixture next to live bridge
+    prices, a mislabelled feed) can't all be right; the first one to connect
+    two currencies wins and contradicting quotes are dropped.
+    """
+    graph, kept = {}, {}
+    for (base, quote), y in quotes.items():
+        implied = _implied(graph, base, quote)
+        if implied is not None and abs(y - implied) > tolerance:
+            continue
+        kept[(base, quote)] = y
+        graph.setdefault(base, []).append((quote, y))
+        graph.setdefault(quote, []).append((base, -y))
+    return kept
+
+
+class _Levels:
+    """Least-squares log level per currency from observed pair quotes.
+
+    log(price of BASE/QUOTE) = v[BASE] - v[QUOTE]. The pseudo-inverse P of that
+    system only changes when the set of pairs does; a new quote on a known pair
+    k moves the levels by P[:, k] * delta (O(N)). Currencies with no path to
+    the anchor are NaN.
+    """
+
+    def __init__(self, currencies, anchor):
+        self.n = len(currencies)
+        self.index = {c: i for i, c in enumerate(currencies)}
+        self.anchor = self.index[anchor]
+        self.pairs = []                     # (base_i, quote_i) per quoted pair
+        self.slot = {}                      # (base_i, quote_i) -> column of y / P
+        self.y = np.empty(0)                # log quotes
+        self.pinv = np.zeros((self.n, 0))
+        self.v = np.full(self.n, np.nan)
+        self.updates = 0
+
+    def assign(self, quotes):
+        """Makes {(base, quote): log price} the full set of pairs; True if the levels moved.
+
+        Pairs missing from `quotes` are dropped. Same pairs as last time with
+        new prices are the O(N) path; a different set of pairs re-solves.
+        """
+        keys = {(self.index[b], self.index[q]): y for (b, q), y in quotes.items()
+                if b in self.index and q in self.index and b != q}
+        if keys.keys() != self.slot.keys():
+            self.pairs = list(keys)
+            self.slot = {key: k for k, key in enumerate(self.pairs)}
+            self.y = np.array([keys[key] for key in self.pairs], dtype=float)
+            self._solve()
+            return True
+        moved = False
+        for key, y in keys.items():
+            k = self.slot[key]
+            if self.y[k] == y:
+                continue
+            self.v += self.pinv[:, k] * (y - self.y[k])
+            self.y[k] = y
+            self.updates += 1
+            moved = True
+            if self.updates % RESOLVE_EVERY == 0:
+                self._solve()
+        return moved
+
+    def _solve(self):
+        m = len(self.pairs)
+        if not m:
+            self.pinv = np.zeros((self.n, 0))
+            self.v = np.full(self.n, np.nan)
+            self.v[self.anchor] = 0.0
+            return
+        b, q = np.array(self.pairs).T
+        A = np.zeros((m, self.n))
+        A[np.arange(m), b] = 1.0
+        A[np.arange(m), q] = -1.0
+        free = np.arange(self.n) != self.anchor
+        P = np.zeros((self.n, m))
+        P[free] = np.linalg.pinv(A[:, free])
+        reached = self._connected()
+        P[~reached] = 0.0
+        self.pinv = P
+        self.v = P @ self.y
+        self.v[~reached] = np.nan
+
+    def _connected(self):
+        reached = np.zeros(self.n, dtype=bool)
+        reached[self.anchor] = True
+        grew = True
+        while grew:
+            grew = False
+            for b, q in self.pairs:
+                if reached[b] != reached[q]:
+                    reached[b] = reached[q] = True
+                    grew = True
+        return reached
+
+
+class CurrencyMatrix:
+    """N x N cross rates, % change since the session open and per-currency strength.
+
+    Fed with whatever pairs are around (bridge ticks, crosses included, then
+    the TICKER_MAP majors from the snapshot); unchanged quotes cost nothing
+    and a changed one is an O(N) update. `version` bumps on every change, so
+    renderers can cache on it.
+    """
+
+    def __init__(self, currencies=CURRENCIES, anchor=ANCHOR):
+        self.currencies = list(currencies)
+        self.live = _Levels(self.currencies, anchor)
+        self.reference = _Levels(self.currencies, anchor)
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def sync(self, quotes, reference=None, now=None, max_age=MAX_QUOTE_AGE):
+        """Applies {"EUR/USD": (time, price)} quotes and {"EUR/USD": open} session opens; True if anything moved.
+
+        `quotes` is the full current set, most trusted source first. Pairs
+        older than max_age (or no longer quoted) are dropped, and so are quotes
+        that contradict the pairs before them or opens that are nowhere near
+        their pair's live quote.
+        """
+        now = time.time() if now is None else now
+        live = {}
+        for symbol, (t, price) in quotes.items():
+            pair = parse_pair(symbol)
+            y = _log_price(price)
+            if pair is None or y is None or pair in live or t is None or now - t > max_age:
+                continue
+            live[pair] = y
+        live = consistent(live)
+
+        opens = {}
+        for symbol, price in (reference or {}).items():
+            pair = parse_pair(symbol)
+            y = _log_price(price)
+            if pair in live and y is not None and abs(y - live[pair]) <= MAX_SESSION_MOVE:
+                opens[pair] = y
+
+        with self._lock:
+            changed = self.live.assign(live)
+            changed = self.reference.assign(opens) or changed
+            if changed:
+                self.version += 1
+        return changed
+
+    def frames(self):
+        """(version, cross rates, % change, strength) from one consistent read"""
+        import pandas as pd     # the app imports this module before the worker has loaded pandas
+        with self._lock:
+            v, v0, version = self.live.v.copy(), self.reference.v.copy(), self.version
+        # rates[i, j] = price of currency i in currency j
+        rates = np.exp(v[:, None] - v[None, :])
+        moved = v - v0
+        change = (np.exp(moved[:, None] - moved[None, :]) - 1) * 100
+        np.fill_diagonal(rates, np.nan)
+        np.fill_diagonal(change, np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)    # all-NaN rows: currency not quoted yet
+            strength = np.nanmean(change, axis=1)   # avg % move against every other currency
+        index = pd.Index(self.currencies)
+        return (version,
+                pd.DataFrame(rates, index=index, columns=index),
+                pd.DataFrame(change, index=index, columns=index),
+                pd.Series(strength, index=index).sort_values(ascending=False))
@@ -0,0 +1,209 @@
+import numpy as np
+import pandas as pd
+
+SMA_N = 20
+EMA_N = 20
+RSI_N = 14
+ATR_N = 14
+Z_N = 20                    # z-score shares the SMA window
+LOOKBACK = 300              # bars per symbol used to seed the state (a full 24h day of 5m bars)
+
+
+def _ns(index):
+    """Index in nanoseconds: yfinance (s), Parquet (ms) and CSV (us) bars must all compare with the stored state"""
+    return index.as_unit("ns")
+
+
+def _panel(frames, symbols, lookback=LOOKBACK):
+    """Right-aligned bars-ago panel: arrays of shape (lookback, symbols), NaN padded.
+
+    Aligning by bar number instead of timestamp means every column is a clean
+    series, so one rolling/ewm pass covers all symbols even when their sessions
+    (FX vs futures vs crypto) don't line up.
+    """
+    shape = (lookback, len(symbols))
+    out = {k: np.full(shape, np.nan) for k in ("Open", "High", "Low", "Close")}
+    out["ts"] = np.zeros(shape, dtype=np.int64)
+    out["day"] = np.zeros(shape, dtype=np.int64)
+    for j, sym in enumerate(symbols):
+        df = frames.get(sym)
+        if df is None or df.empty:
+            continue
+        df = df.iloc[-lookback:]
+        n = len(df)
+        index = _ns(df.index)
+        for k in ("Open", "High", "Low", "Close"):
+            out[k][-n:, j] = df[k].to_numpy(dtype=float)
+        out["ts"][-n:, j] = index.asi8
+        out["day"][-n:, j] = index.normalize().asi8   # local (exchange tz) midnight
+    return out
+
+
+class TimeframeState:
+    """SMA / EMA / RSI / ATR / z-score state for every symbol on one timeframe.
+
+    Every indicator is kept as O(1)-updatable arrays with one slot per symbol.
+    The newest bar of each symbol is held as `pending` (it may still be
+    forming); it is folded into the committed state once a newer bar arrives,
+    and values() peeks one step ahead to include it.
+    """
+
+    def __init__(self, symbols):
+        k = len(symbols)
+        self.symbols = list(symbols)
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.window = np.full((k, SMA_N), np.nan)   # ring of committed closes
+        self.pos = np.zeros(k, dtype=np.int64)       # next slot to overwrite (oldest)
+        self.sum = np.zeros(k)
+        self.sumsq = np.zeros(k)
+        self.count = np.zeros(k, dtype=np.int64)
+        self.ema = np.full(k, np.nan)
+        self.avg_gain = np.full(k, np.nan)
+        self.avg_loss = np.full(k, np.nan)
+        self.atr = np.full(k, np.nan)
+        self.prev_close = np.full(k, np.nan)
+        self.session_day = np.zeros(k, dtype=np.int64)
+        self.session_open = np.full(k, np.nan)
+        # pending (newest, possibly forming) bar
+        self.p_ts = np.zeros(k, dtype=np.int64)
+        self.p_day = np.zeros(k, dtype=np.int64)
+        self.p_bar = np.full((k, 4), np.nan)          # open, high, low, close
+
+    # --- VECTORIZED SEED ---
+    @classmethod
+    def from_frames(cls, frames, symbols, lookback=LOOKBACK):
+        state = cls(symbols)
+        p = _panel(frames, state.symbols, lookback)
+        c, h, l = p["Close"], p["High"], p["Low"]
+        has = ~np.isnan(c[-1])
+        committed = pd.DataFrame(c[:-1])
+
+        # SMA / z-score window: the last SMA_N committed closes, oldest at slot 0
+        state.window = c[-1 - SMA_N:-1].T.copy()
+        state.sum = np.nansum(state.window, axis=1)
+        state.sumsq = np.nansum(state.window ** 2, axis=1)
+        state.count = (~np.isnan(state.window)).sum(axis=1)
+
+        state.ema = committed.ewm(span=EMA_N, adjust=False).mean().iloc[-1].to_numpy(dtype=float, copy=True)
+        delta = committed.diff()
+        state.avg_gain = delta.clip(lower=0).ewm(alpha=1 / RSI_N, adjust=False).mean().iloc[-1].to_numpy(dtype=float, copy=True)
+        state.avg_loss = (-delta).clip(lower=0).ewm(alpha=1 / RSI_N, adjust=False).mean().iloc[-1].to_numpy(dtype=float, copy=True)
+
+        prev_c = np.vstack([np.full((1, c.shape[1]), np.nan), c[:-2]])
+        tr = np.fmax(h[:-1] - l[:-1], np.fmax(np.abs(h[:-1] - prev_c), np.abs(l[:-1] - prev_c)))
+        state.atr = pd.DataFrame(tr).ewm(alpha=1 / ATR_N, adjust=False).mean().iloc[-1].to_numpy(dtype=float, copy=True)
+        state.prev_close = c[-2].copy()
+
+        # Session open = open of the first bar sharing the newest bar's local day
+        same_day = p["day"] == p["day"][-1]
+        first = same_day.argmax(axis=0)
+        state.session_day = np.where(has, p["day"][-1], 0)
+        state.session_open = np.where(has, p["Open"][first, np.arange(c.shape[1])], np.nan)
+
+        state.p_ts = np.where(has, p["ts"][-1], 0)
+        state.p_day = state.session_day.copy()
+        state.p_bar = np.stack([p["Open"][-1], h[-1], l[-1], c[-1]], axis=1)
+        return state
+
+    # --- O(1) STEP (vectorized over the symbols in `sel`) ---
+    def _step(self, sel):
+        o, h, l, c = self.p_bar[sel].T
+        oldest = self.window[sel, self.pos[sel]]
+        old = np.nan_to_num(oldest)
+        count = np.where(np.isnan(oldest), self.count[sel] + 1, self.count[sel])
+        s = self.sum[sel] - old + c
+        ss = self.sumsq[sel] - old ** 2 + c ** 2
+
+        ema = np.where(np.isnan(self.ema[sel]), c, self.ema[sel] + (2 / (EMA_N + 1)) * (c - self.ema[sel]))
+        prev = self.prev_close[sel]
+        delta = c - prev
+        gain, loss = np.clip(delta, 0, None), np.clip(-delta, 0, None)
+        ag = np.where(np.isnan(self.avg_gain[sel]), gain, self.avg_gain[sel] + (gain - self.avg_gain[sel]) / RSI_N)
+        al = np.where(np.isnan(self.avg_loss[sel]), loss, self.avg_loss[sel] + (loss - self.avg_loss[sel]) / RSI_N)
+        ag = np.where(np.isnan(delta), self.avg_gain[sel], ag)
+        al = np.where(np.isnan(delta), self.avg_loss[sel], al)
+        tr = np.fmax(h - l, np.fmax(np.abs(h - prev), np.abs(l - prev)))
+        atr = np.where(np.isnan(self.atr[sel]), tr, self.atr[sel] + (tr - self.atr[sel]) / ATR_N)
+        return {"sum": s, "sumsq": ss, "count": count, "ema": ema, "avg_gain": ag, "avg_loss": al, "atr": atr}
+
+    def _commit(self, sel):
+        new = self._step(sel)
+        for name, value in new.items():
+            getattr(self, name)[sel] = value
+        self.window[sel, self.pos[sel]] = self.p_bar[sel, 3]
+        self.pos[sel] = (self.pos[sel] + 1) % SMA_N
+        self.prev_close[sel] = self.p_bar[sel, 3]
+        # Re-sum once per lap so float error can't creep in
+        lap = sel[self.pos[sel] == 0]
+        self.sum[lap] = np.nansum(self.window[lap], axis=1)
+        self.sumsq[lap] = np.nansum(self.window[lap] ** 2, axis=1)
+
+    def update(self, symbol, ts, o, h, l, c, day):
+        """Feeds one bar (ns timestamp, OHLC, local-day key). Same ts = revision of the forming bar."""
+        i = self.index.get(symbol)
+        if i is None or ts < self.p_ts[i]:
+            return
+        if ts > self.p_ts[i]:
+            if not np.isnan(self.p_bar[i, 3]):
+                self._commit(np.array([i]))
+            if day != self.session_day[i]:
+                self.session_day[i], self.session_open[i] = day, o
+            self.p_ts[i], self.p_day[i] = ts, day
+        self.p_bar[i] = (o, h, l, c)
+
+    def update_frame(self, symbol, df):
+        """Feeds every bar of df at or after the pending one"""
+        i = self.index.get(symbol)
+        if i is None or df is None or df.empty:
+            return
+        index = _ns(df.index)
+        keep = index.asi8 >= self.p_ts[i]
+        df, index = df[keep], index[keep]
+        for ts, day, (o, h, l, c) in zip(index.asi8, index.normalize().asi8, df[["Open", "High", "Low", "Close"]].to_numpy(dtype=float)):
+            self.update(symbol, ts, o, h, l, c, day)
+
+    # --- READ ---
+    def values(self):
+        """symbol x indicator frame, including the pending bar"""
+        sel = np.arange(len(self.symbols))
+        new = self._step(sel)
+        c = self.p_bar[:, 3]
+        n = new["count"]
+        mean = np.where(n > 0, new["sum"] / np.maximum(n, 1), np.nan)
+        var = np.where(n > 1, (new["sumsq"] - n * mean ** 2) / np.maximum(n - 1, 1), np.nan)
+        std = np.sqrt(np.clip(var, 0, None))
+        full = n >= SMA_N
+        with np.errstate(divide="ignore", invalid="ignore"):     # flat prices: avg_loss == 0, handled below
+            rs = new["avg_gain"] / new["avg_loss"]
+        rsi = np.where(new["avg_loss"] == 0, 100.0, 100 - 100 / (1 + rs))
+        return pd.DataFrame({
+            "close": c,
+            "sma": np.where(full, mean, np.nan),
+            "ema": new["ema"],
+            "rsi": rsi,
+            "atr": new["atr"],
+            "zscore": np.where(full & (std > 0), (c - mean) / np.where(std > 0, std, 1), np.nan),
+            "session_open": self.session_open,
+        }, index=self.symbols)
+
+
+class IndicatorEngine:
+    """TimeframeState per interval, seeded from the bar store and fed incrementally"""
+
+    def __init__(self, symbols, intervals=("5m", "1h", "1d")):
+        self.symbols = list(symbols)
+        self.intervals = list(intervals)
+        self.states = {}
+
+    def sync(self, interval, frames):
+        """Seeds the interval from full frames the first time, afterwards only feeds new bars"""
+        state = self.states.get(interval)
+        if state is None:
+            self.states[interval] = TimeframeState.from_frames(frames, self.symbols)
+            return
+        for sym, df in frames.items():
+            state.update_frame(sym, df)
+
+    def values(self, interval):
+        state = self.states.get(interval)
+        return None if state is None else state.values()
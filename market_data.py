@@ -0,0 +1,175 @@
+import os
+import time
+import pandas as pd
+import shared_cache
+import metrics
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# --- FETCH SETTINGS ---
+PRIMARY = ("1d", "5m")      # (period, interval) used for the live table
+FALLBACK = ("5d", "1h")     # used when a symbol has no intraday bars (weekend, holiday)
+MAX_WORKERS = 20            # bounded pool: one worker per TICKER_MAP symbol
+SYMBOL_TIMEOUT = 10         # seconds allowed per upstream call
+BATCH_TIMEOUT = 20          # hard ceiling for the whole universe
+
+
+# ================= PROVIDERS =================
+class YahooProvider:
+    """Live bars from yfinance (one batch call + per-symbol history).
+
+    yfinance is imported on first use, so fixture runs and warm starts never load it.
+    """
+
+    def history(self, y_sym, period="1d", interval="5m", start=None):
+        import yfinance as yf
+        shared_cache.rate_limit("yfinance")
+        ticker = yf.Ticker(y_sym)
+        if start is not None:
+            return ticker.history(start=start, interval=interval, timeout=SYMBOL_TIMEOUT)
+        return ticker.history(period=period, interval=interval, timeout=SYMBOL_TIMEOUT)
+
+    def download(self, y_syms, period="1d", interval="5m", start=None):
+        import yfinance as yf
+        window = {"start": start} if start is not None else {"period": period}
+        shared_cache.rate_limit("yfinance", tokens=len(y_syms))   # yfinance fans out one request per symbol
+        df = yf.download(list(y_syms), interval=interval, group_by="ticker",
+                         threads=MAX_WORKERS, progress=False, timeout=BATCH_TIMEOUT, **window)
+        frames = {}
+        for y_sym in y_syms:
+            try:
+                sub = df[y_sym] if isinstance(df.columns, pd.MultiIndex) else df
+                frames[y_sym] = sub.dropna(how="all")
+            except KeyError:
+                frames[y_sym] = pd.DataFrame()
+        return frames
+
+
+class FixtureProvider:
+    """Offline bars from recorded CSVs: <fixture_dir>/<symbol>_<interval>.csv"""
+
+    def __init__(self, fixture_dir, latency=0.0):
+        self.fixture_dir = fixture_dir
+        self.latency = latency  # simulated round-trip in seconds
+
+    def path_for(self, y_sym, interval):
+        safe = y_sym.replace("=", "_").replace("^", "_").replace("/", "_")
+        return os.path.join(self.fixture_dir, f"{safe}_{interval}.csv")
+
+    def history(self, y_sym, period="1d", interval="5m", start=None):
+        if self.latency: time.sleep(self.latency)
+        path = self.path_for(y_sym, interval)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        df = pd.read_csv(path, index_col=0)
+        df.index = pd.to_datetime(df.index, utc=True)
+        if start is not None:
+            start = pd.Timestamp(start)
+            if start.tzinfo is None: start = start.tz_localize("UTC")
+            df = df[df.index >= start]
+        return df
+
+
+def get_provider():
+    """Fixture provider when ALPHAEDGE_FIXTURES is set, otherwise live Yahoo"""
+    fixture_dir = os.environ.get("ALPHAEDGE_FIXTURES")
+    if fixture_dir:
+        return FixtureProvider(fixture_dir, latency=float(os.environ.get("ALPHAEDGE_FIXTURE_LATENCY", 0)))
+    return YahooProvider()
+
+
+# ================= UNIVERSE FETCH =================
+def _fetch_one(provider, y_sym, primary, fallback, start=None, stage="single"):
+    if stage == "fallback": metrics.inc("fallback_total", symbol=y_sym)
+    with metrics.timer("fetch_seconds", symbol=y_sym, interval=primary[1], stage=stage):
+        df = provider.history(y_sym, period=primary[0], interval=primary[1], start=start)
+    if (df is None or df.empty) and fallback:
+        metrics.inc("fallback_total", symbol=y_sym)
+        with metrics.timer("fetch_seconds", symbol=y_sym, interval=fallback[1], stage="fallback"):
+            df = provider.history(y_sym, period=fallback[0], interval=fallback[1])
+    return df if df is not None else pd.DataFrame()
+
+
+def fetch_universe(provider, y_syms, primary=PRIMARY, fallback=FALLBACK, max_workers=MAX_WORKERS, timeout=BATCH_TIMEOUT, start=None):
+    """Fetches bars for every symbol at once.
+
+    Tries a single batch download first (if the provider has one), then fans the
+    misses out over a bounded thread pool with the fallback window. Symbols that
+    fail or miss the deadline come back as empty frames. Passing start= asks for
+    bars from that timestamp on instead of the primary period.
+    """
+    y_syms = list(y_syms)
+    frames = {}
+
+    if hasattr(provider, "download"):
+        try:
+            with metrics.timer("batch_seconds", interval=primary[1]):
+                frames = provider.download(y_syms, period=primary[0], interval=primary[1], start=start)
+        except Exception as e:
+            print(f"   ⚠️ Batch download failed, going per-symbol: {e}")
+            metrics.inc("fetch_errors_total", symbol="batch")
+            frames = {}
+
+    missing = [s for s in y_syms if s not in frames or frames[s].empty]
+    if missing:
+        # Batch already tried the primary window, so only the fallback is left for those
+        first = fallback if frames and fallback else primary
+        rest = None if first is fallback else fallback
+        pool = ThreadPoolExecutor(max_workers=min(max_workers, len(missing)))
+        stage = "fallback" if first is fallback else "single"
+        futures = {pool.submit(_fetch_one, provider, s, first, rest, start, stage): s for s in missing}
+        done, not_done = wait(futures, timeout=timeout)
+        for fut in done:
+            try:
+                frames[futures[fut]] = fut.result()
+            except Exception as e:
+                print(f"   ❌ {futures[fut]}: {e}")
+                metrics.inc("fetch_errors_total", symbol=futures[fut])
+        for fut in not_done:
+            print(f"   ⏱️ {futures[fut]} timed out")
+            metrics.inc("fetch_timeouts_total", symbol=futures[fut])
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return {s: frames.get(s, pd.DataFrame()) for s in y_syms}
+
+
+# ================= DASHBOARD ROWS =================
+def build_dashboard_rows(ticker_map, values, higher=None):
+    """Bias / score / tech row per symbol, in TICKER_MAP order.
+
+    `values` is an IndicatorEngine frame (index = yfinance symbol) for the table's
+    timeframe; `higher` maps extra intervals to their frames for the MTF notes.
+    """
+    results = []
+    for symbol, y_sym in ticker_map.items():
+        try:
+            v = values.loc[y_sym]
+            current_price = v['close']
+            if pd.isna(current_price):
+                metrics.inc("rows_skipped_total", symbol=symbol)
+                continue
+            sma_20 = v['sma']
+            if pd.isna(sma_20): sma_20 = current_price
+            bias = "BULLISH" if current_price > sma_20 else "BEARISH"
+            open_price = v['session_open'] if v['session_open'] > 0 else current_price
+            pct_change = ((current_price - open_price) / open_price) * 100
+            score = int(min(max(abs(pct_change) * 50, 1), 10))
+            if bias == "BEARISH": score = -score
+            tech = "Overbought" if score >= 8 else "Oversold" if score <= -8 else "Neutral"
+
+            # Higher timeframes: trend = close vs EMA-20 on that interval
+            mtf = {}
+            for interval, frame in (higher or {}).items():
+                if frame is not None and y_sym in frame.index and not pd.isna(frame.at[y_sym, 'ema']):
+                    mtf[interval] = "BULLISH" if frame.at[y_sym, 'close'] > frame.at[y_sym, 'ema'] else "BEARISH"
+
+            results.append({
+                "Symbol": symbol, "Bias": bias, "Score": score,
+                "Trend": "Upward" if bias=="BULLISH" else "Downward",
+                "Tech": tech, "Price": current_price, "Open": open_price,
+                "RSI": v['rsi'], "ATR %": v['atr'] / current_price * 100, "Z": v['zscore'], "MTF": mtf,
+            })
+        except Exception as e:
+            # Used to be a silent `continue`: keep going, but make it visible
+            print(f"   ❌ Row {symbol}: {e}")
+            metrics.inc("row_errors_total", symbol=symbol)
+    return results
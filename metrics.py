@@ -0,0 +1,154 @@
+import time
+import threading
+import functools
+import contextlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# In-process counters / gauges / timing summaries. One dict update under a lock
+# per event, so it stays on in production. Exposed in the ?admin=<key> panel
+# (ALPHAEDGE_ADMIN_KEY) and as Prometheus text (render(), or serve() on
+# ALPHAEDGE_METRICS_PORT).
+#
+# Label values must stay low-cardinality (symbol, interval, tab, report...).
+
+PREFIX = "alphaedge_"
+HOST = "127.0.0.1"          # exporter bind address; widen explicitly (ALPHAEDGE_METRICS_HOST) for a remote scraper
+
+_lock = threading.Lock()
+_counters = {}      # (name, labels) -> float
+_gauges = {}        # (name, labels) -> float
+_summaries = {}     # (name, labels) -> [count, sum, max, last]
+
+
+def _key(name, labels):
+    return PREFIX + name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+# ================= RECORDING =================
+def inc(name, value=1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name, value, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _gauges[key] = value
+
+
+def observe(name, value, **labels):
+    key = _key(name, labels)
+    with _lock:
+        s = _summaries.get(key)
+        if s is None:
+            _summaries[key] = [1, value, value, value]
+        else:
+            s[0] += 1
+            s[1] += value
+            s[2] = max(s[2], value)
+            s[3] = value
+
+
+@contextlib.contextmanager
+def timer(name, **labels):
+    """with metrics.timer("fetch_seconds", symbol="ES=F"): ..."""
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - t, **labels)
+
+
+def timed(name, **labels):
+    """Decorator form of timer()"""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with timer(name, **labels):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+# ================= READING =================
+def snapshot():
+    """{"counters": [...], "gauges": [...], "summaries": [...]} as plain rows for the admin panel"""
+    with _lock:
+        counters = [{"metric": n, **dict(l), "value": v} for (n, l), v in _counters.items()]
+        gauges = [{"metric": n, **dict(l), "value": v} for (n, l), v in _gauges.items()]
+        summaries = [{"metric": n, **dict(l), "count": s[0], "avg_ms": s[1] / s[0] * 1000, "max_ms": s[2] * 1000,
+                      "last_ms": s[3] * 1000} for (n, l), s in _summaries.items()]
+    return {"counters": sorted(counters, key=lambda r: r["metric"]),
+            "gauges": sorted(gauges, key=lambda r: r["metric"]),
+            "summaries": sorted(summaries, key=lambda r: r["metric"])}
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render():
+    """Prometheus text exposition format (counters, gauges, summaries as _count/_sum/_max)"""
+    with _lock:
+        counters, gauges = dict(_counters), dict(_gauges)
+        summaries = {k: list(v) for k, v in _summaries.items()}
+
+    lines, typed = [], set()
+
+    def header(name, kind):
+        if name in typed:
+            return
+        typed.add(name)
+        lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in sorted(counters.items()):
+        header(name, "counter")
+        lines.append(f"{name}{_labels(labels)} {value}")
+    for (name, labels), value in sorted(gauges.items()):
+        header(name, "gauge")
+        lines.append(f"{name}{_labels(labels)} {value}")
+    for (name, labels), (count, total, _, _) in sorted(summaries.items()):
+        header(name, "summary")
+        lines.append(f"{name}_count{_labels(labels)} {count}")
+        lines.append(f"{name}_sum{_labels(labels)} {total:.6f}")
+    for (name, labels), (_, _, peak, _) in sorted(summaries.items()):
+        header(name + "_max", "gauge")
+        lines.append(f"{name}_max{_labels(labels)} {peak:.6f}")
+    return "\n".join(lines) + "\n"
+
+
+# ================= EXPORTER =================
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("", "/metrics"):
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port, host=HOST):
+    """Serves /metrics for Prometheus on a daemon thread; returns the server, or None if the port is taken"""
+    try:
+        server = ThreadingHTTPServer((host, port), _Handler)
+    except OSError as e:
+        # Another replica on this host already exports (its numbers are per-process too)
+        print(f"   ❌ Metrics port {host}:{port}: {e} (exporter off)")
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"📈 Metrics on http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,134 @@
+import time
+import threading
+from scheduler import RefreshScheduler
+import shared_cache
+import snapshot
+import metrics
+
+REFRESH_SECONDS = 60        # same cadence the old st.cache_data(ttl=60) gave us
+TABLE_INTERVAL = "5m"
+FALLBACK_INTERVAL = "1h"    # used for symbols with no 5m bars
+HIGHER_INTERVALS = ["1h", "1d"]
+
+
+class MarketRefresher:
+    """Process-wide background worker that keeps the latest market snapshot in memory.
+
+    Streamlit sessions only ever call snapshot(); the upstream fetch happens on
+    this thread, so no viewer pays for yfinance latency on a rerun. The last
+    snapshot saved to disk is served (marked warm) until the first refresh
+    lands, and pandas/yfinance are only imported on the worker thread.
+    """
+
+    def __init__(self, ticker_map, provider=None, interval=REFRESH_SECONDS):
+        self.ticker_map = dict(ticker_map)
+        self.provider = provider
+        self.interval = interval
+        self.bars = self.engine = None     # built by _setup() on the worker thread
+        self.scheduler = RefreshScheduler()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._snapshot = snapshot.load(self.ticker_map.values()) or {"rows": [], "sentiment": {}, "updated_at": None}
+        if self._snapshot["updated_at"] is not None:
+            self._ready.set()
+
+    # --- LIFECYCLE ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="alphaedge-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"   ❌ Refresh failed, keeping last snapshot: {e}")
+                metrics.inc("refresh_errors_total")
+            self._stop.wait(self.interval)
+
+    # --- WORK ---
+    def _setup(self):
+        """Heavy imports and the bar store / indicator engine (restored from disk when possible)"""
+        import market_data
+        from bar_store import BarStore
+        from indicators import IndicatorEngine
+        self.provider = self.provider or market_data.get_provider()
+        self.bars = BarStore(self.provider)
+        self.engine = IndicatorEngine(self.ticker_map.values(), intervals=[TABLE_INTERVAL, *HIGHER_INTERVALS])
+        if snapshot.load_state(self.engine):
+            print("   ♻️ Indicator state restored from disk")
+
+    def refresh(self):
+        """Publishes the shared snapshot; only one replica per cycle actually computes it"""
+        if self.engine is None:
+            self._setup()
+        key = "market:snapshot:" + ",".join(self.ticker_map.values())
+        with metrics.timer("refresh_seconds"):
+            snap = shared_cache.get_or_compute(key, self.interval, self._compute)
+        metrics.set_gauge("snapshot_updated_timestamp", snap["updated_at"])
+        with self._lock:
+            self._snapshot = snap  # swap the whole dict, readers never see a half-built one
+        self._ready.set()
+        try:
+            snapshot.save(snap, self.ticker_map.values())
+        except (OSError, TypeError, ValueError) as e:
+            print(f"   ⚠️ Could not save snapshot: {e}")
+        return snap
+
+    def _compute(self):
+        import market_data
+        import sentiment
+        y_syms = list(self.ticker_map.values())
+        # Only open markets whose TTL ran out go upstream, and only for the gap since
+        # the last stored bar; the engine only sees new bars
+        now = time.time()
+        for interval in [TABLE_INTERVAL, *HIGHER_INTERVALS]:
+            due = self.scheduler.due(y_syms, interval, now)
+            if due:
+                self._sync(interval, due)
+                self.scheduler.mark(due, interval, now)
+
+        values = self.engine.values(TABLE_INTERVAL)
+        fallback = self.engine.values(FALLBACK_INTERVAL)
+        if fallback is not None:
+            missing = values['close'].isna()
+            values.loc[missing] = fallback.loc[missing]
+        higher = {interval: self.engine.values(interval) for interval in HIGHER_INTERVALS}
+        rows = market_data.build_dashboard_rows(self.ticker_map, values, higher)
+        closed = self.scheduler.closed(y_syms, now)
+        for row in rows:
+            row["Closed"] = self.ticker_map[row["Symbol"]] in closed   # stale-while-closed
+
+        # Daily bars barely move, so this is a TTL-cached lookup most cycles
+        labels = sentiment.get_sentiment_map(self.provider, y_syms)
+
+        try:
+            snapshot.save_state(self.engine)
+        except OSError as e:
+            print(f"   ⚠️ Could not save indicator state: {e}")
+        return {"rows": rows, "sentiment": labels, "updated_at": time.time()}
+
+    def _sync(self, interval, y_syms):
+        with metrics.timer("bar_update_seconds", interval=interval):
+            self.bars.update(y_syms, interval)
+        with metrics.timer("indicator_sync_seconds", interval=interval):
+            self.engine.sync(interval, {s: self.bars.load(s, interval) for s in y_syms})
+
+    # --- READERS ---
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot
+
+    def age(self):
+        updated = self.snapshot()["updated_at"]
+        return None if updated is None else time.time() - updated
+
+    def wait_until_ready(self, timeout=None):
+        return self._ready.wait(timeout)
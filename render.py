@@ -0,0 +1,158 @@
+import os
+import json
+import threading
+import metrics
+
+# Finished HTML for the big tables, keyed by the version of the data behind them
+# (snapshot updated_at, cot_live.json mtime). Module-level, so every session of
+# the process shares it; a rerun that didn't change the data is a dict lookup.
+
+_cache = {}             # name -> (version, html)
+_cache_lock = threading.Lock()
+
+
+def cached(name, version, build):
+    """build() once per new version of `name`, the stored HTML otherwise"""
+    with _cache_lock:
+        entry = _cache.get(name)
+    if entry is not None and entry[0] == version:
+        metrics.inc("render_cache_total", table=name, result="hit")
+        return entry[1]
+    metrics.inc("render_cache_total", table=name, result="miss")
+    with metrics.timer("render_seconds", table=name):
+        html = build()
+    with _cache_lock:
+        _cache[name] = (version, html)
+    return html
+
+
+# ================= DASHBOARD HEATMAP =================
+HEATMAP_HEAD = """<table class="heatmap-table"><thead><tr><th>SYMBOL</th><th>BIAS</th><th>SCORE</th><th>TREND</th><th>TECH</th><th>PRICE</th><th>SOURCE</th><th>NOTES</th></tr></thead><tbody>"""
+
+
+def row_notes(row):
+    """RSI + higher-timeframe trend arrows for the NOTES column"""
+    parts = []
+    rsi = row.get('RSI')
+    if rsi is not None and rsi == rsi: parts.append(f"RSI {rsi:.0f}")
+    for interval, bias in row.get('MTF', {}).items():
+        parts.append(f"{interval.upper()} {'▲' if bias == 'BULLISH' else '▼'}")
+    return " · ".join(parts)
+
+
+def heatmap_parts(rows):
+    """Per row: (symbol, html before the PRICE cell, html after SOURCE, snapshot price, snapshot source)"""
+    parts = []
+    for row in rows:
+        css_class = "bullish" if row['Bias'] == "BULLISH" else "bearish"
+        head = f"""<tr><td><b>{row['Symbol']}</b></td><td class="{css_class}">{row['Bias']}</td><td class="{css_class}">{row['Score']:+}</td><td>{row['Trend']}</td><td>{row['Tech']}</td>"""
+        tail = f"""<td>{row_notes(row)}</td></tr>"""
+        parts.append((row['Symbol'], head, tail, row['Price'], "🌙 CLOSED" if row.get('Closed') else "⚡ LIVE"))
+    return parts
+
+
+def heatmap_table(parts, ticks):
+    """Splices live prices into the prebuilt rows; a fresh bridge tick beats the delayed yfinance close"""
+    if not parts:
+        return HEATMAP_HEAD + "<tr><td colspan='8'>Loading Data...</td></tr></tbody></table>"
+    body = []
+    for symbol, head, tail, price, source in parts:
+        tick = ticks.get(symbol)
+        if tick: price, source = tick[1], "⚡ TICK"
+        body.append(f"""{head}<td style="color:#D4AF37; font-weight:bold;">{price:,.4f}</td><td><span class="live-tag">{source}</span></td>{tail}""")
+    return HEATMAP_HEAD + "".join(body) + "</tbody></table>"
+
+
+# ================= COT TABLE =================
+COT_HEAD = """<table class="heatmap-table" style="width:100%; text-align:center;"><thead><tr style="background:#111; color:#D4AF37;"><th>Symbol</th><th>Longs</th><th>Shorts</th><th>Δ Long</th><th>Δ Short</th><th>Long %</th><th>Short %</th><th>Net %</th><th>Net Pos</th><th>OI</th><th>Δ OI</th><th>COT Idx 26W</th><th>COT Idx 52W</th><th>COT Idx 156W</th><th>52W %ile</th></tr></thead><tbody>"""
+
+
+def _idx_cell(v):
+    if v is None: return "<td>—</td>"
+    cls = "bull-strong" if v >= 80 else "bear-strong" if v <= 20 else ""
+    return f'<td class="{cls}">{v:.0f}</td>'
+
+
+def _int_cell(v, signed=False, colored=False):
+    if v is None or v != v: return "<td>—</td>"
+    color = "#00E676" if v > 0 else "#FF5252"
+    style = f' style="color:{color}"' if colored else ""
+    return f"<td{style}>{int(v):{'+,' if signed else ','}}</td>"
+
+
+def cot_row(sym, row):
+    l_pct = row.get('long_pct') or 0; s_pct = row.get('short_pct') or 0
+    l_cls = "bull-strong" if l_pct > 60 else "bull-med" if l_pct > 50 else ""
+    s_cls = "bear-strong" if s_pct > 60 else "bear-med" if s_pct > 50 else ""
+    net = row.get('net_pos')
+    net_cell = "<td>—</td>" if net is None else f"""<td style="font-weight:bold; background-color:{'#2962FF' if net > 0 else '#D50000'}; color:white;">{int(net):,}</td>"""
+    net_pct = "—" if row.get('net_pct') is None else f"{row['net_pct']:.2f}%"
+    # Weekly numbers CFTC left as "." come through as None: shown as a dash
+    pos_cells = _int_cell(row.get('long_pos')) + _int_cell(row.get('short_pos')) + _int_cell(row.get('change_long'), True, True) + _int_cell(row.get('change_short'), True, True)
+    # COT index (26/52/156w) + 52w percentile, precomputed by cot_history
+    stat_cells = "".join(_idx_cell(row.get(f"cot_index_{w}")) for w in (26, 52, 156)) + _idx_cell(row.get("pctile_52"))
+
+    return f"""<tr><td class="symbol-col">{sym}</td>{pos_cells}<td class="{l_cls}">{l_pct:.1f}%</td><td class="{s_cls}">{s_pct:.1f}%</td><td>{net_pct}</td>{net_cell}{_int_cell(row.get('open_int'))}{_int_cell(row.get('change_oi'), True)}{stat_cells}</tr>"""
+
+
+def cot_version(path):
+    """(mtime_ns, size) of the COT file, or None when it is missing"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def cot_table(path):
+    """Whole COT table from cot_live.json in one pass"""
+    with open(path, "r") as f: data = json.load(f)
+    return COT_HEAD + "".join(cot_row(sym, vals) for sym, vals in data.items()) + "</tbody></table>"
+
+
+# ================= CURRENCY MATRIX =================
+def _rate(v):
+    if v != v: return "—"
+    return f"{v:,.2f}" if v >= 100 else f"{v:.3f}" if v >= 10 else f"{v:.4f}"
+
+
+def _pct(v):
+    return "—" if v != v else f"{v:+.2f}%"
+
+
+def _move_cls(pct):
+    if pct != pct: return ""
+    if pct >= 0.5: return "bull-strong"
+    if pct >= 0.1: return "bull-med"
+    if pct <= -0.5: return "bear-strong"
+    if pct <= -0.1: return "bear-med"
+    return ""
+
+
+def fx_matrix_table(rates, change):
+    """Cross rate (base row in quote column) with its % move since the session open underneath"""
+    ccys = list(rates.index)
+    head = "".join(f"<th>{c}</th>" for c in ccys)
+    r, c = rates.to_numpy(), change.to_numpy()
+    body = []
+    for i, base in enumerate(ccys):
+        cells = "".join(
+            "<td>—</td>" if i == j else
+            f'<td class="{_move_cls(c[i, j])}">{_rate(r[i, j])}<br><small>{_pct(c[i, j])}</small></td>'
+            for j in range(len(ccys)))
+        body.append(f'<tr><td class="symbol-col">{base}</td>{cells}</tr>')
+    return f"""<table class="heatmap-table" style="width:100%; text-align:center;"><thead><tr style="background:#111; color:#D4AF37;"><th>BASE \\ QUOTE</th>{head}</tr></thead><tbody>{"".join(body)}</tbody></table>"""
+
+
+def fx_strength_table(strength):
+    """Currencies ranked by their average % move against all the others"""
+    rows = "".join(
+        f'<tr><td>{rank}</td><td class="symbol-col">{ccy}</td><td class="{_move_cls(score)}">{_pct(score)}</td></tr>'
+        for rank, (ccy, score) in enumerate(strength.items(), start=1))
+    return f"""<table class="heatmap-table" style="width:100%; text-align:center;"><thead><tr><th>#</th><th>CURRENCY</th><th>STRENGTH</th></tr></thead><tbody>{rows}</tbody></table>"""
+
+
+def fx_tables(matrix):
+    """(matrix html, strength html) for a CurrencyMatrix, from one consistent read"""
+    _, rates, change, strength = matrix.frames()
+    return fx_matrix_table(rates, change), fx_strength_table(strength)
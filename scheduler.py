@@ -0,0 +1,101 @@
+import time
+import datetime
+from zoneinfo import ZoneInfo
+
+ET = ZoneInfo("America/New_York")   # every session below is defined in New York time
+
+# --- SECONDS BETWEEN REFRESHES WHILE A MARKET IS OPEN ---
+ASSET_TTL = {"crypto": 60, "fx": 60, "futures": 60, "index": 300}
+INTERVAL_TTL = {"5m": 0, "1h": 300, "1d": 3600}   # bigger bars don't need 60s refreshes
+
+COT_RELEASE = (4, 15, 30)   # Friday 15:30 ET (holiday shifts are not modelled)
+COT_RETRY = 3 * 3600        # after a check that found nothing new, look again this often
+
+
+def asset_class(y_sym):
+    if y_sym.endswith("-USD"): return "crypto"
+    if y_sym.endswith("=X"): return "fx"
+    if y_sym.endswith("=F"): return "futures"
+    return "index"
+
+
+def is_open(klass, now=None):
+    """Session calendar per asset class (exchange holidays are not modelled)"""
+    t = datetime.datetime.fromtimestamp(time.time() if now is None else now, ET)
+    wd, mins = t.weekday(), t.hour * 60 + t.minute
+    if klass == "crypto":
+        return True
+    if klass == "fx":
+        # Sunday 17:00 -> Friday 17:00
+        return not (wd == 5 or (wd == 4 and mins >= 17 * 60) or (wd == 6 and mins < 17 * 60))
+    if klass == "futures":
+        # CME Globex: Sunday 18:00 -> Friday 17:00, daily break 17:00-18:00
+        if wd == 5 or (wd == 4 and mins >= 17 * 60) or (wd == 6 and mins < 18 * 60):
+            return False
+        return not (17 * 60 <= mins < 18 * 60)
+    # Cboe index values (^VIX): weekdays 03:15-16:15
+    return wd < 5 and 3 * 60 + 15 <= mins < 16 * 60 + 15
+
+
+def last_cot_release(now=None):
+    """Timestamp of the most recent Friday 15:30 ET CFTC publication"""
+    t = datetime.datetime.fromtimestamp(time.time() if now is None else now, ET)
+    wd, hour, minute = COT_RELEASE
+    release = t.replace(hour=hour, minute=minute, second=0, microsecond=0) - datetime.timedelta(days=(t.weekday() - wd) % 7)
+    if release > t:
+        release -= datetime.timedelta(days=7)
+    return release.timestamp()
+
+
+def next_cot_release(now=None):
+    return last_cot_release(now) + 7 * 86400
+
+
+def cot_due(last_refresh, now=None, last_check=None):
+    """True when CFTC has published since `last_refresh` (a timestamp, or None).
+
+    `last_check` is the last time CFTC was asked at all. Once it has been
+    asked since the release without anything new (published late, holiday
+    shift), it is only asked again every COT_RETRY seconds.
+    """
+    now = time.time() if now is None else now
+    release = last_cot_release(now)
+    if last_refresh is not None and last_refresh >= release:
+        return False
+    return last_check is None or last_check < release or now - last_check >= COT_RETRY
+
+
+class RefreshScheduler:
+    """Decides which (symbol, interval) pairs are worth an upstream call right now.
+
+    A pair is due when its TTL has elapsed and its market is open now or was
+    open at the last refresh (so the closing bar still gets picked up). Pairs
+    never refreshed are always due, so a weekend start still has data.
+    """
+
+    def __init__(self):
+        self._last = {}     # (y_sym, interval) -> timestamp
+
+    def ttl(self, y_sym, interval):
+        return max(ASSET_TTL[asset_class(y_sym)], INTERVAL_TTL.get(interval, 0))
+
+    def due(self, y_syms, interval, now=None):
+        now = time.time() if now is None else now
+        out = []
+        for y_sym in y_syms:
+            last = self._last.get((y_sym, interval))
+            if last is None:
+                out.append(y_sym)
+                continue
+            klass = asset_class(y_sym)
+            if now - last >= self.ttl(y_sym, interval) and (is_open(klass, now) or is_open(klass, last)):
+                out.append(y_sym)
+        return out
+
+    def mark(self, y_syms, interval, now=None):
+        now = time.time() if now is None else now
+        for y_sym in y_syms:
+            self._last[(y_sym, interval)] = now
+
+    def closed(self, y_syms, now=None):
+        return {s for s in y_syms if not is_open(asset_class(s), now)}
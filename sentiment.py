@@ -0,0 +1,64 @@
+import time
+import threading
+import numpy as np
+import pandas as pd
+import market_data
+import shared_cache
+import metrics
+
+WINDOW = ("14d", "1d")      # (period, interval) of daily bars
+MIN_BARS = 14
+SENTIMENT_TTL = 900         # daily bars, no point pulling them more than every 15 min
+
+# --- LABELS ---
+NEUTRAL = "Neutral ⚖️"
+NOT_ENOUGH_DATA = "Neutral 😐"
+
+_cache = {"key": None, "value": None, "at": 0.0}
+_cache_lock = threading.Lock()
+
+
+def close_panel(frames):
+    """Daily closes as one time x symbol frame"""
+    closes = {s: df['Close'] for s, df in frames.items() if df is not None and not df.empty and 'Close' in df}
+    if not closes:
+        return pd.DataFrame(columns=list(frames))
+    return pd.concat(closes, axis=1).reindex(columns=list(frames)).sort_index()
+
+
+def compute_sentiment(panel):
+    """14-day change and label for every column of the panel in one pass"""
+    first = panel.bfill().iloc[0] if len(panel) else pd.Series(np.nan, index=panel.columns)
+    last = panel.ffill().iloc[-1] if len(panel) else pd.Series(np.nan, index=panel.columns)
+    change = (last - first) / first * 100
+    bars = panel.notna().sum()
+
+    # Thresholds are % change over the window
+    c = change.to_numpy(dtype=float)
+    labels = np.select(
+        [bars.to_numpy() < MIN_BARS, c > 5, c > 1, c < -5, c < -1],
+        [NOT_ENOUGH_DATA, "Strong Buy 🚀", "Bullish 📈", "Strong Sell 🔻", "Bearish 📉"],
+        default=NEUTRAL,
+    )
+    return pd.DataFrame({"change": change, "label": labels}, index=panel.columns)
+
+
+def get_sentiment_map(provider, y_syms, ttl=SENTIMENT_TTL):
+    """{y_sym: label} for the whole universe, cached for ttl seconds"""
+    key = tuple(y_syms)
+    with _cache_lock:
+        if _cache["key"] == key and time.time() - _cache["at"] < ttl:
+            metrics.inc("cache_requests_total", cache="sentiment_local", result="hit")
+            return _cache["value"]
+    metrics.inc("cache_requests_total", cache="sentiment_local", result="miss")
+
+    def compute():
+        frames = market_data.fetch_universe(provider, key, primary=WINDOW, fallback=None)
+        return compute_sentiment(close_panel(frames))["label"].to_dict()
+
+    # In-process copy first, then the cross-replica one
+    value = shared_cache.get_or_compute("sentiment:" + ",".join(key), ttl, compute)
+
+    with _cache_lock:
+        _cache.update(key=key, value=value, at=time.time())
+    return value
@@ -0,0 +1,168 @@
+import os
+import time
+import uuid
+import pickle
+import sqlite3
+import threading
+from contextlib import closing
+import metrics
+
+# One SQLite file shared by every Streamlit replica on the host (WAL mode, so
+# readers never block the writer). Point ALPHAEDGE_SHARED_CACHE elsewhere to
+# share it across containers via a common volume.
+CACHE_PATH = os.environ.get("ALPHAEDGE_SHARED_CACHE", os.path.join("data", "shared_cache.sqlite"))
+LEASE_SECONDS = 120         # a crashed leader blocks a key for at most this long (a live one keeps renewing)
+POLL_SECONDS = 0.25
+
+# --- GLOBAL YFINANCE BUDGET (all replicas together) ---
+YF_RATE = 5.0               # requests per second
+YF_BURST = 20
+
+INSTANCE_ID = uuid.uuid4().hex[:8]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, stored_at REAL, expires_at REAL);
+CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT, expires_at REAL);
+CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL, updated_at REAL);
+"""
+_initialized = set()
+
+
+def _connect(path=None):
+    path = os.path.abspath(path or CACHE_PATH)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # isolation_level=None: we issue BEGIN IMMEDIATE ourselves where it matters
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    if path not in _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        _initialized.add(path)
+    return conn
+
+
+# ================= KEY / VALUE =================
+def get(key):
+    """(value, stored_at, fresh) or (None, None, False) when the key was never stored"""
+    with closing(_connect()) as conn:
+        row = conn.execute("SELECT value, stored_at, expires_at FROM cache WHERE key=?", (key,)).fetchone()
+    if row is None:
+        return None, None, False
+    return pickle.loads(row[0]), row[1], row[2] > time.time()
+
+
+def put(key, value, ttl):
+    now = time.time()
+    with closing(_connect()) as conn:
+        conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", (key, pickle.dumps(value), now, now + ttl))
+
+
+# ================= SINGLE-FLIGHT =================
+def _owner():
+    # Per process and thread (pid read at call time, so forked workers differ too)
+    return f"{INSTANCE_ID}-{os.getpid()}-{threading.get_ident()}"
+
+
+def _try_lease(conn, key, owner):
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT owner, expires_at FROM leases WHERE key=?", (key,)).fetchone()
+        if row is not None and row[1] > now and row[0] != owner:
+            return False
+        conn.execute("INSERT OR REPLACE INTO leases VALUES (?, ?, ?)", (key, owner, now + LEASE_SECONDS))
+        return True
+    finally:
+        conn.execute("COMMIT")
+
+
+def _release(conn, key, owner):
+    conn.execute("DELETE FROM leases WHERE key=? AND owner=?", (key, owner))
+
+
+def _keep_lease(key, owner, done):
+    """Pushes the lease forward every LEASE_SECONDS/3 until `done` is set, so a slow compute keeps it"""
+    with closing(_connect()) as conn:
+        while not done.wait(LEASE_SECONDS / 3):
+            conn.execute("UPDATE leases SET expires_at=? WHERE key=? AND owner=?", (time.time() + LEASE_SECONDS, key, owner))
+
+
+def _compute_leased(key, owner, compute):
+    done = threading.Event()
+    threading.Thread(target=_keep_lease, args=(key, owner, done), name="lease-renew", daemon=True).start()
+    try:
+        return compute()
+    finally:
+        done.set()
+
+
+def get_or_compute(key, ttl, compute, stale_ok=True, wait=60, on_wait=None):
+    """Returns the cached value for key, computing it in exactly one process at a time.
+
+    Fresh hit -> cached value. Miss/expired -> whoever takes the lease runs
+    compute() and stores the result; everyone else returns the stale value
+    (if stale_ok and there is one) or waits up to `wait` seconds for the
+    leader, then computes locally as a last resort. A value stored after
+    this call started always counts, so ttl=0 coalesces only in-flight work.
+    """
+    cache = key.split(":")[0]   # metric label: market / sentiment / cot
+    started = time.time()
+    value, stored_at, fresh = get(key)
+    if fresh:
+        metrics.inc("cache_requests_total", cache=cache, result="hit")
+        return value
+
+    owner = _owner()
+    deadline = started + wait
+    waiting = False
+    with closing(_connect()) as conn:
+        while True:
+            if _try_lease(conn, key, owner):
+                try:
+                    # Someone may have finished between our read and the lease
+                    value, stored_at, fresh = get(key)
+                    if fresh or (stored_at is not None and stored_at >= started):
+                        metrics.inc("cache_requests_total", cache=cache, result="hit")
+                        return value
+                    metrics.inc("cache_requests_total", cache=cache, result="miss")
+                    value = _compute_leased(key, owner, compute)
+                    put(key, value, ttl)
+                    return value
+                finally:
+                    _release(conn, key, owner)
+
+            if stale_ok and stored_at is not None:
+                metrics.inc("cache_requests_total", cache=cache, result="stale")
+                return value
+            if not waiting and on_wait:
+                on_wait()
+            waiting = True
+            if time.time() > deadline:
+                metrics.inc("cache_requests_total", cache=cache, result="wait_timeout")
+                return compute()
+            time.sleep(POLL_SECONDS)
+            value, stored_at, fresh = get(key)
+            if fresh or (stored_at is not None and stored_at >= started):
+                metrics.inc("cache_requests_total", cache=cache, result="coalesced")
+                return value
+
+
+# ================= RATE LIMITER =================
+def rate_limit(name="yfinance", tokens=1, rate=YF_RATE, burst=YF_BURST):
+    """Blocks until `tokens` are available in the shared token bucket `name`"""
+    tokens = min(tokens, burst)
+    with closing(_connect()) as conn:
+        while True:
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE name=?", (name,)).fetchone()
+                have = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+                granted = have >= tokens
+                conn.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)", (name, have - tokens if granted else have, now))
+            finally:
+                conn.execute("COMMIT")
+            if granted:
+                return
+            metrics.inc("rate_limited_total", bucket=name)
+            with metrics.timer("rate_limit_wait_seconds", bucket=name):
+                time.sleep((tokens - have) / rate)
@@ -0,0 +1,62 @@
+import os
+import json
+import time
+import pickle
+import tempfile
+
+# Bump when the row/sentiment layout or the indicator state changes shape;
+# older files are then ignored and the app starts cold once.
+# 2: rows carry the session "Open" (currency matrix reference)
+# 3: indicator state timestamps always in ns
+SNAPSHOT_VERSION = 3
+SNAPSHOT_PATH = os.path.join("data", "snapshot.json")
+STATE_PATH = os.path.join("data", "indicator_state.pkl")
+
+
+def _atomic_write(path, data, mode="w"):
+    # Unique temp file per writer: every replica saves each cycle
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, mode) as f: f.write(data)
+    os.replace(tmp, path)
+
+
+def _plain(value):
+    # NumPy scalars -> Python scalars
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+# ================= DASHBOARD + SENTIMENT (JSON, no pandas needed to read) =================
+def save(snap, symbols, path=SNAPSHOT_PATH):
+    payload = {"version": SNAPSHOT_VERSION, "symbols": list(symbols), "saved_at": time.time(),
+               "rows": snap["rows"], "sentiment": snap["sentiment"], "updated_at": snap["updated_at"]}
+    _atomic_write(path, json.dumps(payload, default=_plain))
+
+
+def load(symbols, path=SNAPSHOT_PATH):
+    """Last saved snapshot marked warm=True, or None if missing / other version / other universe"""
+    try:
+        with open(path, "r") as f: payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != SNAPSHOT_VERSION or payload.get("symbols") != list(symbols):
+        return None
+    return {"rows": payload["rows"], "sentiment": payload["sentiment"], "updated_at": payload["updated_at"], "warm": True}
+
+
+# ================= INDICATOR STATE (pickled TimeframeStates) =================
+def save_state(engine, path=STATE_PATH):
+    payload = {"version": SNAPSHOT_VERSION, "symbols": engine.symbols, "states": engine.states}
+    _atomic_write(path, pickle.dumps(payload), mode="wb")
+
+
+def load_state(engine, path=STATE_PATH):
+    """Restores engine.states so the first refresh only feeds new bars; True if restored"""
+    try:
+        with open(path, "rb") as f: payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return False
+    if payload.get("version") != SNAPSHOT_VERSION or payload.get("symbols") != engine.symbols:
+        return False
+    engine.states = {k: v for k, v in payload["states"].items() if k in engine.intervals}
+    return True
@@ -0,0 +1,15 @@
+import os
+import sys
+import pytest
+
+# The app is a flat set of modules next to app.py, not a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Fresh cwd (data/, cot_live.json, shared cache) so the checkout is never touched"""
+    import shared_cache
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(shared_cache, "CACHE_PATH", str(tmp_path / "data" / "shared_cache.sqlite"))
+    return tmp_path
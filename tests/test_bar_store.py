@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+import bar_store
+from bar_store import BarStore, RETENTION
+from market_data import FixtureProvider
+
+NOW = pd.Timestamp.now(tz="UTC").floor("5min")
+
+
+def frame(start, end):
+    index = pd.date_range(start, end, freq="5min")
+    close = np.linspace(100, 101, len(index))
+    return pd.DataFrame({"Open": close, "High": close + 0.1, "Low": close - 0.1, "Close": close, "Volume": 0}, index=index)
+
+
+@pytest.fixture
+def provider(tmp_path):
+    """FixtureProvider over 5m CSVs ending at the current bar, recording every start= it is asked for"""
+    provider = FixtureProvider(str(tmp_path / "fixtures"))
+    (tmp_path / "fixtures").mkdir()
+    provider.calls = []
+    history = provider.history
+
+    def recording(y_sym, period="1d", interval="5m", start=None):
+        provider.calls.append((y_sym, period, start))
+        return history(y_sym, period=period, interval=interval, start=start)
+
+    provider.history = recording
+    return provider
+
+
+def publish(provider, y_sym, start, end=NOW):
+    frame(start, end).to_csv(provider.path_for(y_sym, "5m"))
+
+
+def seed(store, y_sym, last):
+    store.append(y_sym, "5m", frame(last - pd.Timedelta(hours=1), last))
+
+
+def test_warm_update_only_asks_for_the_gap(workdir, provider):
+    publish(provider, "ES=F", NOW - pd.Timedelta(days=2))
+    store = BarStore(provider, root=str(workdir / "bars"))
+    last = NOW - pd.Timedelta(minutes=30)
+    seed(store, "ES=F", last)
+
+    store.update(["ES=F"])
+    assert provider.calls == [("ES=F", None, last)]
+    df = store.load("ES=F", "5m")
+    assert df.index[-1] == NOW and df.index.is_unique and df.index.is_monotonic_increasing
+
+
+def test_append_drops_duplicate_bars_and_keeps_the_revision(workdir, provider):
+    store = BarStore(provider, root=str(workdir / "bars"))
+    store.append("ES=F", "5m", frame(NOW - pd.Timedelta(minutes=20), NOW))
+    revised = frame(NOW - pd.Timedelta(minutes=5), NOW + pd.Timedelta(minutes=5))
+    revised.loc[NOW, "Close"] = 123.0
+    df = store.append("ES=F", "5m", revised)
+    assert len(df) == 6 and df.index.is_unique
+    assert df.at[NOW, "Close"] == 123.0
+    assert pd.read_parquet(store.path_for("ES=F", "5m")).equals(df)
+
+
+def test_gap_past_upstream_lookback_is_fetched_cold(workdir, provider, monkeypatch):
+    monkeypatch.setattr(bar_store, "RETENTION", {"5m": pd.Timedelta(days=365)})
+    publish(provider, "GC=F", NOW - pd.Timedelta(days=2))
+    store = BarStore(provider, root=str(workdir / "bars"))
+    seed(store, "GC=F", NOW - pd.Timedelta(days=90))
+
+    store.update(["GC=F"])
+    assert provider.calls == [("GC=F", bar_store.COLD_PERIOD["5m"], None)]
+
+
+def test_warm_symbols_are_batched_by_how_recent_they_are(workdir, provider):
+    store = BarStore(provider, root=str(workdir / "bars"))
+    lasts = {"A=F": NOW - pd.Timedelta(minutes=10), "B=F": NOW - pd.Timedelta(minutes=40),
+             "C=F": NOW - pd.Timedelta(days=3)}
+    for y_sym, last in lasts.items():
+        publish(provider, y_sym, NOW - pd.Timedelta(days=4))
+        seed(store, y_sym, last)
+
+    store.update(list(lasts))
+    starts = {y_sym: start for y_sym, _, start in provider.calls}
+    assert starts["A=F"] == starts["B=F"] == lasts["B=F"]      # one group, from its oldest gap
+    assert starts["C=F"] == lasts["C=F"]                        # the stale one doesn't widen it
+
+
+def test_retention_is_trimmed_against_now(workdir, provider):
+    store = BarStore(provider, root=str(workdir / "bars"))
+    df = store.append("ES=F", "5m", frame(NOW - RETENTION["5m"] - pd.Timedelta(hours=2), NOW - pd.Timedelta(days=1)))
+    assert df.index[0] >= pd.Timestamp.now(tz="UTC") - RETENTION["5m"]
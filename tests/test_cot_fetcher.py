@@ -0,0 +1,150 @@
+import os
+import json
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import pytest
+import cot_fetcher
+import render
+
+WEEK_1, WEEK_2 = "2026-10-06", "2026-10-13"
+
+
+def report_line(name, date, values):
+    """One CFTC comma line: values maps column index -> text, every other column is 0"""
+    fields = ["0"] * 40
+    fields[0], fields[1], fields[2] = f'"{name}"', date.replace("-", "")[2:], date
+    for i, v in values.items():
+        fields[i] = str(v)
+    return ",".join(fields)
+
+
+def write_reports(root, date, silver_change_long="150", wheat_oi="1"):
+    disagg = [
+        report_line("GOLD - COMMODITY EXCHANGE INC.", date, {7: 500000, 12: 200000, 13: 50000, 24: 1200, 29: 3000, 30: -800}),
+        # CFTC prints "." for a figure it has no value for
+        report_line("SILVER - COMMODITY EXCHANGE INC.", date, {7: 150000, 12: 40000, 13: 20000, 24: 300, 29: silver_change_long, 30: 90}),
+        report_line("WHEAT-SRW - CHICAGO BOARD OF TRADE", date, {7: wheat_oi, 12: 1, 13: 1}),
+    ]
+    tff = [report_line("EURO FX - CHICAGO MERCANTILE EXCHANGE", date, {7: 700000, 14: 60000, 15: 90000, 24: -500, 31: 100, 32: 2000})]
+    with open(os.path.join(root, "f_disagg.txt"), "w") as f: f.write("\n".join(disagg) + "\n")
+    with open(os.path.join(root, "FinFutWk.txt"), "w") as f: f.write("\n".join(tff) + "\n")
+
+
+class Handler(SimpleHTTPRequestHandler):
+    """Static stand-in for cftc.gov; records status codes and can ignore validators"""
+    statuses = []
+    honor_validators = True
+
+    def do_GET(self):
+        if not self.honor_validators:
+            del self.headers["If-Modified-Since"]
+            del self.headers["If-None-Match"]
+        super().do_GET()
+
+    def log_request(self, code="-", size="-"):
+        self.statuses.append(int(code))
+
+
+@pytest.fixture
+def cftc(workdir, monkeypatch):
+    root = workdir / "cftc"
+    root.mkdir()
+    handler = type("CftcHandler", (Handler,), {"statuses": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=str(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(cot_fetcher, "COT_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    yield root, handler
+    server.shutdown()
+    server.server_close()
+
+
+def live():
+    with open(cot_fetcher.LIVE_PATH, "r") as f: return json.load(f)
+
+
+def test_first_update_writes_live_file_and_skips_dot_rows(cftc):
+    root, handler = cftc
+    write_reports(root, WEEK_1, silver_change_long=".")
+    assert cot_fetcher.update_cot_data()
+
+    data = live()
+    assert list(data) == ["EUR", "Gold"]          # SILVER had a "." and is skipped, like the old scanner
+    assert data["Gold"]["net_pos"] == 150000
+    assert data["EUR"]["change_short"] == 2000
+    assert sorted(handler.statuses) == [200, 200]
+    html = render.cot_table(cot_fetcher.LIVE_PATH)
+    assert "SILVER" not in html and ">150,000</td>" in html
+
+
+def test_padded_dot_only_drops_its_own_row(cftc):
+    root, handler = cftc
+    # Space-padded blanks, one in a tracked market and one in a market we don't track
+    write_reports(root, WEEK_1, silver_change_long="   .", wheat_oi="   .")
+    assert cot_fetcher.update_cot_data()
+    assert list(live()) == ["EUR", "Gold"]
+
+
+def test_not_modified_leaves_live_file_alone(cftc):
+    root, handler = cftc
+    write_reports(root, WEEK_1)
+    assert cot_fetcher.update_cot_data()
+    before = os.stat(cot_fetcher.LIVE_PATH).st_mtime_ns
+
+    handler.statuses.clear()
+    assert cot_fetcher.update_cot_data()
+    assert handler.statuses == [304, 304]
+    assert os.stat(cot_fetcher.LIVE_PATH).st_mtime_ns == before
+
+
+def test_unchanged_body_is_detected_by_hash(cftc):
+    root, handler = cftc
+    handler.honor_validators = False
+    write_reports(root, WEEK_1)
+    assert cot_fetcher.update_cot_data()
+    before = os.stat(cot_fetcher.LIVE_PATH).st_mtime_ns
+
+    handler.statuses.clear()
+    assert cot_fetcher.update_cot_data()
+    assert handler.statuses == [200, 200]
+    assert os.stat(cot_fetcher.LIVE_PATH).st_mtime_ns == before
+
+
+def test_new_week_is_appended_to_history(cftc):
+    root, handler = cftc
+    handler.honor_validators = False
+    write_reports(root, WEEK_1)
+    assert cot_fetcher.update_cot_data()
+    write_reports(root, WEEK_2)
+    assert cot_fetcher.update_cot_data()
+
+    data = live()
+    assert list(data) == ["EUR", "SILVER", "Gold"]
+    history = cot_fetcher.CotHistory()
+    assert len(history.df[history.df["symbol"] == "Gold"]) == 2
+
+
+def test_cot_row_renders_missing_numbers_as_dash():
+    row = {"long_pos": None, "short_pos": 100.0, "change_long": None, "change_short": -5.0, "long_pct": 0.0,
+           "short_pct": 100.0, "net_pct": None, "net_pos": None, "open_int": 1000.0, "change_oi": None}
+    html = render.cot_row("SILVER", row)
+    assert html.count("<td>—</td>") == 9      # 5 missing numbers + 4 stat columns
+    assert '<td style="color:#FF5252">-5</td>' in html
+
+
+def test_unchanged_check_is_recorded_for_the_scheduler(cftc):
+    import scheduler
+    root, handler = cftc
+    write_reports(root, WEEK_1)
+    assert cot_fetcher.update_cot_data()
+    first = cot_fetcher.last_checked()
+    assert cot_fetcher.update_cot_data()
+    assert handler.statuses[-2:] == [304, 304]
+    checked = cot_fetcher.last_checked()
+    assert checked > first
+
+    # Live file from before the release, CFTC asked after it: no new job until COT_RETRY
+    release = scheduler.last_cot_release(checked)
+    assert not scheduler.cot_due(release - 60, now=checked + 60, last_check=checked)
+    assert scheduler.cot_due(release - 60, now=checked + scheduler.COT_RETRY, last_check=checked)
+    assert scheduler.cot_due(release - 60, now=checked + 60, last_check=release - 30)
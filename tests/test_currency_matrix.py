@@ -0,0 +1,65 @@
+import numpy as np
+from currency_matrix import CurrencyMatrix, MAX_QUOTE_AGE, consistent, parse_pair
+
+NOW = 1_800_000_000.0
+QUOTES = {"EUR/USD": 1.16, "USD/JPY": 150.0, "GBP/USD": 1.34, "EUR/GBP": 0.8657, "AUD/JPY": 98.0, "USD/CHF": 0.80}
+
+
+def fresh(quotes, t=NOW):
+    return {sym: (t, price) for sym, price in quotes.items()}
+
+
+def test_parse_pair():
+    assert parse_pair("EUR/JPY") == ("EUR", "JPY")
+    assert parse_pair("GOLD") is None and parse_pair("S&P 500") is None
+
+
+def test_cross_rate_implied_by_two_majors():
+    m = CurrencyMatrix()
+    m.sync(fresh({"EUR/USD": 1.16, "USD/JPY": 150.0}), now=NOW)
+    _, rates, _, _ = m.frames()
+    assert np.isclose(rates.at["EUR", "JPY"], 174.0)
+    assert np.isclose(rates.at["JPY", "EUR"], 1 / 174.0)
+    assert np.isnan(rates.at["GBP", "USD"])            # never quoted
+
+
+def test_incremental_updates_match_a_full_solve():
+    m = CurrencyMatrix()
+    m.sync(fresh(QUOTES), now=NOW)
+    rng = np.random.default_rng(1)
+    quotes = dict(QUOTES)
+    for _ in range(300):
+        sym = rng.choice(list(quotes))
+        quotes[sym] *= 1 + rng.normal(0, 1e-4)
+        m.sync(fresh(quotes), now=NOW)
+    assert m.live.updates == 300                       # same pairs: every tick took the O(N) path
+
+    solved = CurrencyMatrix()
+    solved.sync(fresh(quotes), now=NOW)
+    assert np.allclose(m.live.v, solved.live.v, atol=1e-12, equal_nan=True)
+
+
+def test_pair_older_than_max_age_is_dropped():
+    m = CurrencyMatrix()
+    m.sync(fresh({"EUR/USD": 1.16, "AUD/JPY": 98.0, "USD/JPY": 150.0}), now=NOW)
+    quotes = fresh({"EUR/USD": 1.16, "USD/JPY": 150.0})
+    quotes["AUD/JPY"] = (NOW - MAX_QUOTE_AGE - 1, 98.0)
+    assert m.sync(quotes, now=NOW)
+    _, rates, _, _ = m.frames()
+    assert np.isnan(rates.at["AUD", "USD"])
+    assert len(m.live.pairs) == 2
+
+
+def test_quote_on_another_scale_is_rejected():
+    # Bridge ticks first, then a fixture close around 100 for a pair they already imply
+    quotes = fresh({"EUR/USD": 1.16, "USD/JPY": 150.0, "EUR/JPY": 174.0})
+    quotes.update(fresh({"GBP/USD": 1.34, "EUR/GBP": 100.0}))
+    kept = consistent({parse_pair(s): np.log(p) for s, (_, p) in quotes.items()})
+    assert ("EUR", "GBP") not in kept and ("EUR", "JPY") in kept
+
+    m = CurrencyMatrix()
+    m.sync(quotes, reference={"EUR/USD": 1.15, "USD/JPY": 0.77}, now=NOW)
+    _, rates, change, _ = m.frames()
+    assert np.isclose(rates.at["EUR", "GBP"], 1.16 / 1.34)
+    assert np.isclose(change.at["EUR", "USD"], (1.16 / 1.15 - 1) * 100)
+    assert np.isnan(change.at["JPY", "USD"])           # an open of 0.77 for USD/JPY is another source
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from indicators import TimeframeState
+
+
+def bars(n, unit="ns", seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    index = pd.date_range("2026-10-12 00:00", periods=n, freq="5min", tz="UTC").as_unit(unit)
+    return pd.DataFrame({"Open": np.r_[close[0], close[:-1]], "High": close * 1.001, "Low": close * 0.999,
+                         "Close": close}, index=index)
+
+
+def test_restart_only_feeds_new_bars_whatever_the_index_unit():
+    # State seeded from second-resolution bars (yfinance), fed again from Parquet (ms)
+    df = bars(400, unit="s")
+    state = TimeframeState.from_frames({"EURUSD=X": df.iloc[:-3]}, ["EURUSD=X"])
+    fed = []
+    update = state.update
+    state.update = lambda *args: (fed.append(args[1]), update(*args))
+    state.update_frame("EURUSD=X", df.set_axis(df.index.as_unit("ms")))
+    assert len(fed) == 4                 # the pending bar again + 3 new ones
+    assert state.values().at["EURUSD=X", "close"] == df["Close"].iloc[-1]
+
+
+def reference(df):
+    """The same indicators over the whole series with plain pandas rolling / ewm"""
+    c, h, l = df["Close"], df["High"], df["Low"]
+    delta = c.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    prev = c.shift()
+    tr = np.fmax(h - l, np.fmax((h - prev).abs(), (l - prev).abs()))
+    mean, std = c.rolling(20).mean(), c.rolling(20).std()
+    return {"close": c.iloc[-1], "sma": mean.iloc[-1], "ema": c.ewm(span=20, adjust=False).mean().iloc[-1],
+            "rsi": (100 - 100 / (1 + gain / loss)).iloc[-1], "atr": tr.ewm(alpha=1 / 14, adjust=False).mean().iloc[-1],
+            "zscore": ((c - mean) / std).iloc[-1]}
+
+
+def test_incremental_updates_match_pandas():
+    df = bars(260)
+    state = TimeframeState.from_frames({"ES=F": df.iloc[:100]}, ["ES=F"])
+    for end in range(101, len(df) + 1, 7):            # new bars arrive a few at a time
+        state.update_frame("ES=F", df.iloc[:end])
+    state.update_frame("ES=F", df)
+    got = state.values().loc["ES=F"]
+    for name, want in reference(df).items():
+        assert np.isclose(got[name], want, rtol=1e-9), name
+
+
+def test_flat_prices_give_rsi_100_without_warnings(recwarn):
+    df = bars(60)
+    df[["Open", "High", "Low", "Close"]] = 100.0
+    state = TimeframeState.from_frames({"ES=F": df}, ["ES=F"])
+    assert state.values().at["ES=F", "rsi"] == 100.0
+    assert not [w for w in recwarn if issubclass(w.category, RuntimeWarning)]
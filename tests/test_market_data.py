@@ -0,0 +1,79 @@
+import pandas as pd
+import market_data
+from market_data import FixtureProvider, fetch_universe, build_dashboard_rows
+from indicators import IndicatorEngine
+
+
+def write_bars(provider, y_sym, interval, closes, freq="5min", end="2026-10-16 15:00"):
+    index = pd.date_range(end=end, periods=len(closes), freq=freq, tz="UTC")
+    closes = pd.Series(closes, index=index, dtype=float)
+    pd.DataFrame({"Open": closes.shift(1).fillna(closes.iloc[0]), "High": closes + 0.5, "Low": closes - 0.5,
+                  "Close": closes, "Volume": 0}, index=index).to_csv(provider.path_for(y_sym, interval))
+
+
+def test_fixture_provider_reads_the_csv_layout(tmp_path):
+    provider = FixtureProvider(str(tmp_path))
+    write_bars(provider, "EURUSD=X", "5m", [1.0, 1.1, 1.2])
+    df = provider.history("EURUSD=X", interval="5m")
+    assert list(df["Close"]) == [1.0, 1.1, 1.2]
+    assert str(df.index.tz) == "UTC"
+    assert provider.history("MISSING=X", interval="5m").empty
+
+
+def test_fixture_provider_start_filters_older_bars(tmp_path):
+    provider = FixtureProvider(str(tmp_path))
+    write_bars(provider, "ES=F", "5m", [1, 2, 3, 4])
+    df = provider.history("ES=F", interval="5m", start=pd.Timestamp("2026-10-16 14:55"))
+    assert list(df["Close"]) == [3, 4]
+
+
+def test_fetch_universe_falls_back_and_returns_every_symbol(tmp_path):
+    provider = FixtureProvider(str(tmp_path))
+    write_bars(provider, "ES=F", "5m", [1, 2, 3])
+    write_bars(provider, "GC=F", "1h", [5, 6], freq="1h")     # no 5m bars: weekend-style fallback
+    frames = fetch_universe(provider, ["ES=F", "GC=F", "NOPE=F"])
+    assert list(frames) == ["ES=F", "GC=F", "NOPE=F"]
+    assert list(frames["ES=F"]["Close"]) == [1, 2, 3]
+    assert list(frames["GC=F"]["Close"]) == [5, 6]
+    assert frames["NOPE=F"].empty
+
+
+def test_fetch_universe_survives_a_failing_symbol(tmp_path, monkeypatch):
+    provider = FixtureProvider(str(tmp_path))
+    write_bars(provider, "ES=F", "5m", [1, 2, 3])
+    real = provider.history
+
+    def history(y_sym, **kwargs):
+        if y_sym == "BAD=F":
+            raise RuntimeError("upstream down")
+        return real(y_sym, **kwargs)
+
+    monkeypatch.setattr(provider, "history", history)
+    frames = fetch_universe(provider, ["ES=F", "BAD=F"])
+    assert len(frames["ES=F"]) == 3
+    assert frames["BAD=F"].empty
+
+
+def test_dashboard_rows_from_fixture_bars(tmp_path):
+    provider = FixtureProvider(str(tmp_path))
+    write_bars(provider, "UP=F", "5m", [100 + i for i in range(40)])
+    write_bars(provider, "DOWN=F", "5m", [100 - i for i in range(40)])
+    ticker_map = {"UP": "UP=F", "DOWN": "DOWN=F", "EMPTY": "EMPTY=F"}
+    frames = fetch_universe(provider, ticker_map.values(), fallback=None)
+
+    engine = IndicatorEngine(list(ticker_map.values()), intervals=("5m",))
+    engine.sync("5m", frames)
+    rows = build_dashboard_rows(ticker_map, engine.values("5m"))
+
+    assert [r["Symbol"] for r in rows] == ["UP", "DOWN"]      # no bars, no row
+    up, down = rows
+    assert up["Bias"] == "BULLISH" and up["Score"] > 0 and up["Price"] == 139
+    assert down["Bias"] == "BEARISH" and down["Score"] < 0 and down["Price"] == 61
+    assert up["Open"] == 100 and -10 <= down["Score"] <= -1
+
+
+def test_get_provider_uses_fixtures_when_configured(tmp_path, monkeypatch):
+    monkeypatch.setenv("ALPHAEDGE_FIXTURES", str(tmp_path))
+    assert isinstance(market_data.get_provider(), FixtureProvider)
+    monkeypatch.delenv("ALPHAEDGE_FIXTURES")
+    assert isinstance(market_data.get_provider(), market_data.YahooProvider)
@@ -0,0 +1,33 @@
+import socket
+import urllib.request
+import metrics
+
+
+def test_render_exposes_counters_gauges_and_summaries():
+    metrics.inc("test_requests_total", route="a")
+    metrics.set_gauge("test_depth", 3, queue="q")
+    metrics.observe("test_seconds", 0.5, stage="x")
+    text = metrics.render()
+    assert 'alphaedge_test_requests_total{route="a"}' in text
+    assert 'alphaedge_test_depth{queue="q"} 3' in text
+    assert 'alphaedge_test_seconds_count{stage="x"}' in text
+
+
+def test_serve_answers_on_metrics():
+    metrics.inc("test_scrapes_total")
+    server = metrics.serve(0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as r:
+            assert r.status == 200 and b"# TYPE" in r.read()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_serve_on_a_busy_port_returns_none(capsys):
+    with socket.socket() as taken:
+        taken.bind((metrics.HOST, 0))
+        taken.listen()
+        assert metrics.serve(taken.getsockname()[1]) is None
+    assert "Metrics port" in capsys.readouterr().out
@@ -0,0 +1,90 @@
+import time
+import threading
+import pytest
+import shared_cache
+
+
+@pytest.fixture
+def cache(workdir):
+    return shared_cache
+
+
+def run_together(n, fn):
+    out, threads = [None] * n, []
+    for i in range(n):
+        def call(i=i):
+            out[i] = fn()
+        threads.append(threading.Thread(target=call))
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return out
+
+
+def test_concurrent_callers_compute_once(cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.5)
+        return "snapshot"
+
+    out = run_together(5, lambda: cache.get_or_compute("market:x", 60, compute, stale_ok=False, wait=10))
+    assert out == ["snapshot"] * 5
+    assert len(calls) == 1
+    assert cache.get_or_compute("market:x", 60, compute) == "snapshot" and len(calls) == 1   # fresh hit
+
+
+def test_stale_value_while_another_caller_holds_the_lease(cache):
+    cache.put("market:x", "old", ttl=0)
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "new"
+
+    leader = threading.Thread(target=lambda: cache.get_or_compute("market:x", 60, slow))
+    leader.start()
+    assert started.wait(5)
+    t = time.time()
+    assert cache.get_or_compute("market:x", 60, lambda: pytest.fail("second compute")) == "old"
+    assert time.time() - t < 1
+    release.set()
+    leader.join()
+    assert cache.get("market:x")[0] == "new"
+
+
+def test_ttl_zero_coalesces_only_work_in_flight(cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.3)
+        return len(calls)
+
+    out = run_together(3, lambda: cache.get_or_compute("cot:update", 0, compute, stale_ok=False, wait=10))
+    assert out == [1, 1, 1]
+    assert cache.get_or_compute("cot:update", 0, compute, stale_ok=False) == 2   # finished work is not reused
+
+
+def test_lease_is_renewed_during_a_long_compute(cache, monkeypatch):
+    monkeypatch.setattr(shared_cache, "LEASE_SECONDS", 0.3)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(1.2)         # four lease lengths
+        return "done"
+
+    out = run_together(2, lambda: cache.get_or_compute("market:y", 60, compute, stale_ok=False, wait=10))
+    assert out == ["done", "done"] and len(calls) == 1
+
+
+def test_token_bucket_waits_for_refill(cache):
+    t = time.time()
+    for _ in range(4):
+        cache.rate_limit("test", rate=10.0, burst=4)       # the burst is free
+    assert time.time() - t < 0.2
+    t = time.time()
+    cache.rate_limit("test", tokens=2, rate=10.0, burst=4)  # 2 tokens at 10/s
+    assert 0.15 <= time.time() - t < 0.6
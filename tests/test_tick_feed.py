@@ -0,0 +1,113 @@
+import sys
+import json
+import time
+import socket
+import threading
+import subprocess
+import pytest
+import tick_feed
+from tick_feed import TickFeed, RingBuffer, normalize
+
+QUOTES = {"EURUSD": 1.16, "GBPJPY.x": 199.5, "XAUUSD": 2400.0, "US30": 42000.0}
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def free_udp_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def writer_cmd(tmp_path):
+    path = tmp_path / "live_prices.json"
+    path.write_text(json.dumps(QUOTES))
+    return path, [sys.executable, tick_feed.__file__, "--path", str(path), "--interval", "0.05"]
+
+
+@pytest.fixture
+def thread_errors(monkeypatch):
+    errors = []
+    monkeypatch.setattr(threading, "excepthook", lambda args: errors.append(args.exc_value))
+    return errors
+
+
+def test_normalize():
+    assert normalize("EURUSD.x") == "EUR/USD"
+    assert normalize("XAUUSD") == "GOLD"
+    assert normalize("WHATEVER") is None
+
+
+def test_ring_buffer_wraps_oldest_first():
+    buf = RingBuffer(capacity=3)
+    for i in range(5):
+        buf.append(i, 10 + i)
+    times, prices = buf.view()
+    assert list(times) == [2, 3, 4] and list(prices) == [12, 13, 14]
+    assert buf.last() == (4, 14)
+
+
+def test_file_feed_follows_a_writer_process(writer_cmd):
+    path, cmd = writer_cmd
+    feed = TickFeed(path=str(path), poll=0.02).start()
+    writer = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+    try:
+        assert wait_for(lambda: feed.history("EUR/USD")[0].size >= 5)
+    finally:
+        writer.terminate()
+        writer.wait()
+        feed.stop()
+    assert set(feed.latest()) == {"EUR/USD", "GBP/JPY", "GOLD", "US 30"}
+    times, prices = feed.history("EUR/USD")
+    assert (times[1:] >= times[:-1]).all() and abs(prices[-1] / 1.16 - 1) < 0.01
+
+
+def test_udp_feed_follows_a_writer_process(writer_cmd, thread_errors):
+    path, cmd = writer_cmd
+    port = free_udp_port()
+    feed = TickFeed(path=str(path.with_name("unused.json")), udp_port=port).start()
+    time.sleep(0.2)     # listener bound before the writer starts sending
+    writer = subprocess.Popen(cmd + ["--udp", str(port)], stdout=subprocess.DEVNULL)
+    try:
+        assert wait_for(lambda: feed.history("GOLD")[0].size >= 3)
+    finally:
+        writer.terminate()
+        writer.wait()
+        feed.stop()
+    assert not thread_errors
+
+
+def test_udp_listener_skips_non_dict_datagrams(tmp_path, thread_errors):
+    port = free_udp_port()
+    feed = TickFeed(path=str(tmp_path / "unused.json"), udp_port=port).start()
+    time.sleep(0.2)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        for payload in (b"[1, 2]", b"42", b"not json", json.dumps({"EURUSD": 1.2}).encode()):
+            s.sendto(payload, ("127.0.0.1", port))
+    try:
+        assert wait_for(lambda: "EUR/USD" in feed.latest())
+    finally:
+        feed.stop()
+    assert not thread_errors
+
+
+def test_udp_port_in_use_keeps_the_file_feed(tmp_path, thread_errors, capsys):
+    path = tmp_path / "live_prices.json"
+    path.write_text(json.dumps(QUOTES))
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as taken:
+        taken.bind(("127.0.0.1", 0))
+        feed = TickFeed(path=str(path), poll=0.02, udp_port=taken.getsockname()[1]).start()
+        try:
+            assert wait_for(lambda: "EUR/USD" in feed.latest())
+            assert wait_for(lambda: "Tick UDP port" in capsys.readouterr().out, timeout=2)
+        finally:
+            feed.stop()
+    assert not thread_errors
@@ -0,0 +1,190 @@
+import os
+import re
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+import numpy as np
+
+PRICES_PATH = "live_prices.json"
+CAPACITY = 4096             # ticks kept per symbol
+POLL_SECONDS = 0.25
+MAX_TICK_AGE = 120          # older than this and the dashboard falls back to yfinance
+
+# --- BRIDGE KEY -> TICKER_MAP SYMBOL (6-letter FX pairs are handled by FX_PAIR) ---
+ALIASES = {
+    "US30": "US 30", "SPX500": "S&P 500", "S&P": "S&P 500",
+    "NAS100": "NASDAQ 100", "NASDAQ": "NASDAQ 100",
+    "XAUUSD": "GOLD", "GOLD": "GOLD", "XAGUSD": "SILVER", "SILVER": "SILVER",
+    "WTI": "OIL (WTI)", "OIL": "OIL (WTI)",
+    "BTCUSD": "BITCOIN", "ETHUSD": "ETHEREUM", "SOLUSD": "SOLANA",
+}
+FX_PAIR = re.compile(r"^([A-Z]{3})([A-Z]{3})$")
+
+
+def normalize(key):
+    """'EURUSD.x' -> 'EUR/USD', 'XAUUSD' -> 'GOLD'; None for keys we don't know"""
+    base = key.split(".")[0].upper()
+    if base in ALIASES:
+        return ALIASES[base]
+    m = FX_PAIR.match(base)
+    return f"{m.group(1)}/{m.group(2)}" if m else None
+
+
+class RingBuffer:
+    """Fixed-size (time, price) history backed by two NumPy arrays"""
+
+    def __init__(self, capacity=CAPACITY):
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.capacity = capacity
+        self.head = 0       # next write slot
+        self.count = 0
+
+    def append(self, t, price):
+        self.times[self.head] = t
+        self.prices[self.head] = price
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def last(self):
+        if not self.count:
+            return None, None
+        i = (self.head - 1) % self.capacity
+        return self.times[i], self.prices[i]
+
+    def view(self):
+        """(times, prices) oldest first, as copies"""
+        if self.count < self.capacity:
+            return self.times[:self.count].copy(), self.prices[:self.count].copy()
+        order = np.r_[self.head:self.capacity, 0:self.head]
+        return self.times[order], self.prices[order]
+
+
+class TickFeed:
+    """Watches live_prices.json (mtime polling) and, optionally, a local UDP port.
+
+    Every changed price is appended to its symbol's RingBuffer. File ticks are
+    stamped with the file's mtime, socket ticks with their arrival time.
+    """
+
+    def __init__(self, path=PRICES_PATH, capacity=CAPACITY, poll=POLL_SECONDS, udp_port=None):
+        self.path = path
+        self.capacity = capacity
+        self.poll = poll
+        self.udp_port = udp_port
+        self.buffers = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._mtime = None
+
+    # --- LIFECYCLE ---
+    def start(self):
+        threading.Thread(target=self._watch_file, name="tick-file", daemon=True).start()
+        if self.udp_port:
+            threading.Thread(target=self._listen_udp, name="tick-udp", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    # --- INGEST ---
+    def ingest(self, quotes, t=None):
+        t = time.time() if t is None else t
+        seen = set()
+        with self._lock:
+            for key, price in quotes.items():
+                sym = normalize(key)
+                if sym is None or sym in seen:
+                    continue
+                try:
+                    price = float(price)
+                except (TypeError, ValueError):
+                    continue
+                seen.add(sym)
+                buf = self.buffers.get(sym)
+                if buf is None:
+                    buf = self.buffers[sym] = RingBuffer(self.capacity)
+                if buf.last()[1] != price:
+                    buf.append(t, price)
+
+    def _watch_file(self):
+        while not self._stop.is_set():
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if mtime != self._mtime:
+                    with open(self.path, "r") as f: quotes = json.load(f)
+                    if isinstance(quotes, dict):
+                        self.ingest(quotes, t=mtime / 1e9)
+                    self._mtime = mtime
+            except (OSError, ValueError):
+                pass  # missing or mid-write file: try again next poll
+            self._stop.wait(self.poll)
+
+    def _listen_udp(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.bind(("127.0.0.1", self.udp_port))
+        except OSError as e:
+            print(f"   ❌ Tick UDP port {self.udp_port}: {e} (file feed only)")
+            sock.close()
+            return
+        sock.settimeout(1.0)
+        while not self._stop.is_set():
+            try:
+                payload, _ = sock.recvfrom(65536)
+                quotes = json.loads(payload)
+            except socket.timeout:
+                continue
+            except (OSError, ValueError):
+                continue
+            if isinstance(quotes, dict):
+                self.ingest(quotes)  # anything else isn't a {key: price} datagram
+        sock.close()
+
+    # --- READERS ---
+    def latest(self, max_age=MAX_TICK_AGE):
+        """{symbol: (time, price)} for every symbol with a tick newer than max_age"""
+        now = time.time()
+        with self._lock:
+            out = {sym: buf.last() for sym, buf in self.buffers.items() if buf.count}
+        return {sym: tp for sym, tp in out.items() if max_age is None or now - tp[0] <= max_age}
+
+    def history(self, symbol):
+        with self._lock:
+            buf = self.buffers.get(symbol)
+            return buf.view() if buf else (np.empty(0), np.empty(0))
+
+
+# ================= LOCAL BRIDGE STAND-IN =================
+def simulate(path=PRICES_PATH, udp_port=None, interval=0.2, steps=None):
+    """Random-walks the quotes in `path` like the bridge would (atomic file swaps or UDP)"""
+    with open(path, "r") as f: quotes = json.load(f)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM) if udp_port else None
+    n = 0
+    while steps is None or n < steps:
+        # One move per symbol, applied to all of its aliases
+        moves = {}
+        for key in quotes:
+            move = moves.setdefault(normalize(key) or key, 1 + random.gauss(0, 0.0002))
+            quotes[key] = round(quotes[key] * move, 5)
+        if sock:
+            sock.sendto(json.dumps(quotes).encode(), ("127.0.0.1", udp_port))
+        else:
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f: json.dump(quotes, f)
+            os.replace(tmp, path)
+        n += 1
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in for the price bridge")
+    parser.add_argument("--path", default=PRICES_PATH)
+    parser.add_argument("--udp", type=int, help="send ticks to this local UDP port instead of rewriting the file")
+    parser.add_argument("--interval", type=float, default=0.2)
+    args = parser.parse_args()
+    print(f"📡 Simulating ticks into {args.udp or args.path} every {args.interval}s (Ctrl+C to stop)")
+    simulate(args.path, args.udp, args.interval)